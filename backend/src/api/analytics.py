@@ -29,7 +29,7 @@ from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 from typing import List
 import os
-import json
+import orjson
 from collections import Counter, defaultdict
 from sqlalchemy import select, func, desc, asc, cast, Date
 from src.config.database import get_db
@@ -103,19 +103,28 @@ class Analytics(BaseModel):
 KB_PATH = os.path.join(os.path.dirname(__file__), "../xfinity_knowledge_base.json")
 
 
+# Flattened knowledge base responses, reused until the file's modification time changes
+_kb_responses_cache = {"mtime": None, "responses": []}
+
+
 def load_kb_responses():
     """
     Load and parse knowledge base responses for analysis.
 
     This function reads the knowledge base JSON file and extracts
     all response entries for statistical analysis. It's used for
-    knowledge base effectiveness metrics and content analysis.
+    knowledge base effectiveness metrics and content analysis. The
+    flattened list is cached and only rebuilt when the file changes.
 
     Returns:
         List[Dict]: List of all knowledge base response entries
     """
-    with open(KB_PATH, "r", encoding="utf-8") as f:
-        kb = json.load(f)["knowledge_base"]["agents"]
+    mtime = os.stat(KB_PATH).st_mtime
+    if _kb_responses_cache["mtime"] == mtime:
+        return _kb_responses_cache["responses"]
+
+    with open(KB_PATH, "rb") as f:
+        kb = orjson.loads(f.read())["knowledge_base"]["agents"]
 
     responses = []
     # Extract all responses from all agents and categories
@@ -124,9 +133,24 @@ def load_kb_responses():
             for resp in cat_data.get("responses", []):
                 responses.append(resp)
 
+    _kb_responses_cache["responses"] = responses
+    _kb_responses_cache["mtime"] = mtime
     return responses
 
 
+def response_time_query():
+    """
+    Messages ordered by conversation and time, for response time analysis.
+
+    Only the three columns the calculation reads are selected, so rows come
+    back as plain tuples instead of full Message objects with their JSON
+    columns.
+    """
+    return select(Message.conversation_id, Message.role, Message.created_at).order_by(
+        Message.conversation_id, Message.created_at
+    )
+
+
 @router.get("/overview", response_model=Analytics)
 async def get_analytics_overview(db: AsyncSession = Depends(get_db)):
     """
@@ -159,8 +183,7 @@ async def get_analytics_overview(db: AsyncSession = Depends(get_db)):
 
     # Calculate average response time with outlier filtering
     # This involves analyzing message timestamps to determine response delays
-    msg_stmt = select(Message).order_by(Message.conversation_id, Message.created_at)
-    msgs = (await db.execute(msg_stmt)).scalars().all()
+    msgs = (await db.execute(response_time_query())).all()
 
     response_times = []
     last_user_msg = {}  # Track last user message per conversation
@@ -249,8 +272,7 @@ async def get_response_time_trend(db: AsyncSession = Depends(get_db)):
         List[ResponseTimeTrend]: Daily average response times
     """
     # Retrieve all messages ordered by conversation and time
-    msg_stmt = select(Message).order_by(Message.conversation_id, Message.created_at)
-    msgs = (await db.execute(msg_stmt)).scalars().all()
+    msgs = (await db.execute(response_time_query())).all()
 
     # Group response times by date
     resp_times_by_date = defaultdict(list)
@@ -465,8 +487,7 @@ async def export_analytics(
     conv_result = await db.execute(conv_stmt)
     conv_data = {str(row[0]): row[1] for row in conv_result.all()}
     # Response time trend
-    msg_stmt = select(Message).order_by(Message.conversation_id, Message.created_at)
-    msgs = (await db.execute(msg_stmt)).scalars().all()
+    msgs = (await db.execute(response_time_query())).all()
     resp_times_by_date = defaultdict(list)
     last_user_msg = {}
     for msg in msgs:
@@ -22,29 +22,60 @@ Endpoints:
 """
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import asyncio
+import re
+import time
 from datetime import datetime
 import uuid
-import json
+import orjson
 import logging
 from openai import OpenAI, RateLimitError
+from prometheus_client import Counter
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.services.chat_service import ChatService
+from src.config.database import async_session, get_db
+from src.config.settings import settings
+from src.services.chat_service import ChatService, new_message_id
 from src.services.conversation_metrics import metrics_collector
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize API router with chat endpoints
 router = APIRouter()
 
-# In-memory message store for demo purposes
-# In production, this would be replaced with a database
-MESSAGES = []
+# Per-message WebSocket traffic is counted rather than logged at INFO level
+websocket_messages_total = Counter(
+    "websocket_messages_total", "Total WebSocket messages", ["direction"]
+)
+_ws_messages_in = websocket_messages_total.labels(direction="inbound")
+_ws_messages_out = websocket_messages_total.labels(direction="outbound")
+
+# Error text patterns used to classify failures in the WebSocket message loop
+_CONNECTION_LOST_RE = re.compile(r"disconnect|closed", re.IGNORECASE)
+_RATE_LIMIT_RE = re.compile(r"rate limit|429", re.IGNORECASE)
+_QUOTA_RE = re.compile(r"insufficient_quota", re.IGNORECASE)
+
+# Last formatted timestamp and the millisecond it was formatted for
+_timestamp_cache = [-1, ""]
+
+
+def utc_now_iso() -> str:
+    """
+    Current UTC time in ISO format, reused within the same millisecond.
+
+    Bursts of outgoing messages share one formatted timestamp instead of
+    building a datetime and formatting it for every send.
+    """
+    ms = time.time_ns() // 1_000_000
+    if ms != _timestamp_cache[0]:
+        _timestamp_cache[0] = ms
+        _timestamp_cache[1] = datetime.utcfromtimestamp(ms / 1000).isoformat(
+            timespec="milliseconds"
+        )
+    return _timestamp_cache[1]
 
 
 class ChatConnectionManager:
@@ -60,7 +91,8 @@ class ChatConnectionManager:
     - Connection state management
     - Error handling for failed connections
     - Graceful disconnection handling
-    - Message queuing for offline clients
+    - Bounded per-client send queues that drop the oldest message when a
+      slow client falls behind
     """
 
     def __init__(self):
@@ -68,10 +100,12 @@ class ChatConnectionManager:
         self.active_connections: Dict[str, WebSocket] = {}
         # Track connection metadata for debugging and analytics
         self.connection_metadata: Dict[str, Dict[str, Any]] = {}
-        # Track last heartbeat time for each connection
-        self.last_heartbeat: Dict[str, datetime] = {}
+        # Track last heartbeat time (time.monotonic()) for each connection
+        self.last_heartbeat: Dict[str, float] = {}
         # Track reconnection attempts for each client
         self.reconnection_attempts: Dict[str, int] = {}
+        # Bounded outbound message queue for each client, drained by run_writer
+        self.send_queues: Dict[str, asyncio.Queue] = {}
 
     async def connect(self, websocket: WebSocket, client_id: str):
         """
@@ -84,13 +118,14 @@ class ChatConnectionManager:
         await websocket.accept()
         self.active_connections[client_id] = websocket
         self.connection_metadata[client_id] = {
-            "connected_at": datetime.utcnow().isoformat(),
+            "connected_at": utc_now_iso(),
             "message_count": 0,
-            "last_activity": datetime.utcnow().isoformat(),
+            "last_activity": utc_now_iso(),
             "client_id": client_id,
         }
-        self.last_heartbeat[client_id] = datetime.utcnow()
+        self.last_heartbeat[client_id] = time.monotonic()
         self.reconnection_attempts[client_id] = 0
+        self.send_queues[client_id] = asyncio.Queue(maxsize=settings.WS_SEND_QUEUE_SIZE)
         logger.info(
             f"Client {client_id} connected. Total connections: {len(self.active_connections)}"
         )
@@ -108,65 +143,87 @@ class ChatConnectionManager:
             del self.connection_metadata[client_id]
         if client_id in self.last_heartbeat:
             del self.last_heartbeat[client_id]
+        self.send_queues.pop(client_id, None)
         # Keep reconnection attempts for potential reconnection
         logger.info(
             f"Client {client_id} disconnected. Total connections: {len(self.active_connections)}"
         )
 
+    def _enqueue(self, message: Dict[str, Any], client_id: str) -> bool:
+        """
+        Queue a message for a client, dropping the oldest one if the queue is full.
+
+        Returns:
+            bool: True if the client has a send queue, False otherwise
+        """
+        queue = self.send_queues.get(client_id)
+        if queue is None:
+            return False
+        if queue.full():
+            # Slow client: drop the oldest pending message rather than
+            # letting outbound traffic grow without bound
+            queue.get_nowait()
+            logger.warning(
+                f"Send queue full for client {client_id}, dropped oldest message"
+            )
+        queue.put_nowait(message)
+        return True
+
     async def send_personal_message(self, message: Dict[str, Any], client_id: str):
         """
-        Send a message to a specific client with error handling.
+        Queue a message for delivery to a specific client.
+
+        The message is sent by the client's writer task (see run_writer), so
+        a slow client never blocks the caller.
 
         Args:
             message: Message data to send
             client_id: Target client identifier
         """
-        if client_id in self.active_connections:
-            websocket = self.active_connections[client_id]
-            logger.info(
-                f"Attempting to send message to client {client_id}, WebSocket state: {websocket.client_state}"
-            )
-            try:
-                logger.info(f"Sending JSON message: {json.dumps(message)[:200]}...")
-                await websocket.send_json(message)
-                logger.info(
-                    f"JSON message sent successfully, checking connection state: {websocket.client_state}"
-                )
-                # Update activity tracking
-                if client_id in self.connection_metadata:
-                    self.connection_metadata[client_id][
-                        "last_activity"
-                    ] = datetime.utcnow().isoformat()
-                    self.connection_metadata[client_id]["message_count"] += 1
-                logger.info(f"Message successfully sent to client {client_id}")
-            except Exception as e:
-                logger.error(
-                    f"Failed to send message to client {client_id}: {e} (WebSocket state: {websocket.client_state})"
-                )
-                await self.disconnect(client_id)
-        else:
+        if not self._enqueue(message, client_id):
             logger.warning(
                 f"Cannot send message to client {client_id}: client not in active connections"
             )
 
     async def broadcast(self, message: Dict[str, Any]):
         """
-        Send a message to all connected clients.
+        Queue a message for all connected clients.
 
         Args:
             message: Message data to broadcast
         """
-        disconnected_clients = []
-        for client_id, websocket in self.active_connections.items():
+        for client_id in tuple(self.send_queues):
+            self._enqueue(message, client_id)
+
+    async def run_writer(self, client_id: str):
+        """
+        Drain a client's send queue onto its WebSocket until it disconnects.
+
+        Args:
+            client_id: Client identifier
+        """
+        queue = self.send_queues.get(client_id)
+        websocket = self.active_connections.get(client_id)
+        if queue is None or websocket is None:
+            return
+
+        while True:
+            message = await queue.get()
             try:
-                await websocket.send_json(message)
+                await websocket.send_text(orjson.dumps(message).decode())
             except Exception as e:
-                logger.error(f"Failed to broadcast to client {client_id}: {e}")
-                disconnected_clients.append(client_id)
+                logger.error(
+                    f"Failed to send message to client {client_id}: {e} (WebSocket state: {websocket.client_state})"
+                )
+                await self.disconnect(client_id)
+                return
 
-        # Clean up disconnected clients
-        for client_id in disconnected_clients:
-            await self.disconnect(client_id)
+            _ws_messages_out.inc()
+            # Update activity tracking
+            if client_id in self.connection_metadata:
+                self.connection_metadata[client_id]["last_activity"] = utc_now_iso()
+                self.connection_metadata[client_id]["message_count"] += 1
+            logger.debug("Message sent to client %s", client_id)
 
     async def send_heartbeat(self, client_id: str):
         """
@@ -181,10 +238,10 @@ class ChatConnectionManager:
         if client_id in self.active_connections:
             websocket = self.active_connections[client_id]
             try:
-                await websocket.send_json(
-                    {"type": "ping", "timestamp": datetime.utcnow().isoformat()}
+                await websocket.send_text(
+                    orjson.dumps({"type": "ping", "timestamp": utc_now_iso()}).decode()
                 )
-                self.last_heartbeat[client_id] = datetime.utcnow()
+                self.last_heartbeat[client_id] = time.monotonic()
                 logger.debug(f"Heartbeat sent to client {client_id}")
                 return True
             except Exception as e:
@@ -201,6 +258,22 @@ class ChatConnectionManager:
         """Get metadata for a specific client."""
         return self.connection_metadata.get(client_id)
 
+    def get_metadata_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get a point-in-time copy of metadata for all connected clients.
+
+        Client IDs are snapshotted before iterating so concurrent connects and
+        disconnects cannot change the dict mid-iteration, and each metadata
+        dict is copied so callers never hold references to live state.
+        """
+        metadata = self.connection_metadata
+        snapshot = {}
+        for client_id in tuple(self.active_connections):
+            client_metadata = metadata.get(client_id)
+            if client_metadata is not None:
+                snapshot[client_id] = dict(client_metadata)
+        return snapshot
+
     def update_reconnection_attempts(self, client_id: str, increment: bool = True):
         """
         Update reconnection attempts for a client.
@@ -274,24 +347,35 @@ class Conversation(BaseModel):
     updatedAt: str
 
 
+# Shared chat service instance, created lazily on first use
+_chat_service: Optional[ChatService] = None
+
+
 # Dependency injection for chat service
-def get_chat_service():
+def get_chat_service() -> ChatService:
     """
-    Dependency provider for chat service instances.
+    Dependency provider for the shared chat service instance.
 
     This function provides a chat service instance to API endpoints,
     enabling dependency injection for better testability and
-    separation of concerns.
+    separation of concerns. The instance is built once and reused so
+    the knowledge base, LLM client and conversation state survive
+    across requests instead of being rebuilt every time.
 
     Returns:
         ChatService: Configured chat service instance
     """
-    return ChatService()
+    global _chat_service
+    if _chat_service is None:
+        _chat_service = ChatService()
+    return _chat_service
 
 
 @router.post("/messages", response_model=Message)
 async def send_message(
-    message: Message, chat_service: ChatService = Depends(get_chat_service)
+    message: Message,
+    chat_service: ChatService = Depends(get_chat_service),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Process a user message and return AI-generated response.
@@ -310,6 +394,7 @@ async def send_message(
     Args:
         message: User message to process
         chat_service: Injected chat service instance
+        db: Database session the turn's messages are stored with
 
     Returns:
         Message: AI-generated response with metadata
@@ -320,25 +405,26 @@ async def send_message(
     # Process message with AI agent routing system
     # This involves intent classification, knowledge base search,
     # and potentially LLM generation for complex queries
-    agent_response = await chat_service.process_message(message.id, message.content)
-
-    # Create assistant message with complete metadata
-    assistant_msg = Message(
-        id=str(uuid.uuid4()),  # Unique response ID
-        content=agent_response["answer"],  # AI-generated response
-        role="assistant",  # Mark as assistant message
-        timestamp=datetime.utcnow().isoformat(),  # Current timestamp
-        agent=agent_response["agent"],  # Agent name
-        agent_type=agent_response["agent_type"],  # Agent category
-        answer_type=agent_response["answer_type"],  # Response source
-        intent=agent_response["intent"],  # Classified intent
-        intent_data=agent_response["intent_data"],  # Intent metadata
-    )
+    agent_response = await chat_service.process_message(message.id, message.content, db)
+
+    # Build the assistant message as a plain dict and encode it directly;
+    # it has the shape of Message, so re-validating it would be wasted work
+    assistant_msg = {
+        "id": new_message_id(),  # Unique response ID
+        "content": agent_response["answer"],  # AI-generated response
+        "role": "assistant",  # Mark as assistant message
+        "timestamp": utc_now_iso(),  # Current timestamp
+        "agent": agent_response["agent"],  # Agent name
+        "agent_type": agent_response["agent_type"],  # Agent category
+        "answer_type": agent_response["answer_type"],  # Response source
+        "intent": agent_response["intent"],  # Classified intent
+        "intent_data": agent_response["intent_data"],  # Intent metadata
+    }
 
-    return assistant_msg
+    return ORJSONResponse(content=assistant_msg)
 
 
-@router.get("/conversations", response_model=List[Conversation])
+@router.get("/conversations", responses={200: {"model": List[Conversation]}})
 async def get_conversations(chat_service: ChatService = Depends(get_chat_service)):
     """
     Retrieve all conversations from the chat service.
@@ -358,35 +444,14 @@ async def get_conversations(chat_service: ChatService = Depends(get_chat_service
     Returns:
         List[Conversation]: List of all conversations with messages
     """
-    conversations = []
-
-    # Iterate through all stored conversations in the chat service
-    for conv_id in chat_service.conversations.keys():
-        # Get message history for each conversation
-        messages = chat_service.get_conversation_history(conv_id)
-
-        # Create conversation object with formatted messages
-        conversations.append(
-            Conversation(
-                id=conv_id,
-                messages=[
-                    Message(
-                        id=str(uuid.uuid4()),
-                        content=msg.content,
-                        role=msg.type,  # Map LangChain message type to role
-                        timestamp=datetime.utcnow().isoformat(),
-                    )
-                    for msg in messages
-                ],
-                createdAt=datetime.utcnow().isoformat(),
-                updatedAt=datetime.utcnow().isoformat(),
-            )
-        )
-
-    return conversations
+    # Serialized payloads are cached on the service and only extended with
+    # new messages, so return them directly without re-validating
+    return ORJSONResponse(content=chat_service.get_serialized_conversations())
 
 
-@router.get("/conversations/{conversation_id}", response_model=Conversation)
+@router.get(
+    "/conversations/{conversation_id}", responses={200: {"model": Conversation}}
+)
 async def get_conversation(
     conversation_id: str, chat_service: ChatService = Depends(get_chat_service)
 ):
@@ -407,24 +472,17 @@ async def get_conversation(
     Raises:
         HTTPException: If conversation is not found
     """
-    # Get message history for the specified conversation
-    messages = chat_service.get_conversation_history(conversation_id)
-
-    # Create and return conversation object
-    return Conversation(
-        id=conversation_id,
-        messages=[
-            Message(
-                id=str(uuid.uuid4()),
-                content=msg.content,
-                role=msg.type,  # Map LangChain message type to role
-                timestamp=datetime.utcnow().isoformat(),
-            )
-            for msg in messages
-        ],
-        createdAt=datetime.utcnow().isoformat(),
-        updatedAt=datetime.utcnow().isoformat(),
-    )
+    conversation = chat_service.get_serialized_conversation(conversation_id)
+    if conversation is None:
+        # Unknown conversations are returned empty
+        now = utc_now_iso()
+        conversation = {
+            "id": conversation_id,
+            "messages": [],
+            "createdAt": now,
+            "updatedAt": now,
+        }
+    return ORJSONResponse(content=conversation)
 
 
 # WebSocket endpoint for real-time chat communication with robust connection management
@@ -453,23 +511,48 @@ async def websocket_endpoint(
     # Connect client using the connection manager
     await connection_manager.connect(websocket, client_id)
 
-    # Use client_id as conversation_id for simplicity
-    conversation_id = client_id
-
     logger.info(f"WebSocket connection established for client {client_id}")
 
-    # Start heartbeat task
-    heartbeat_task = asyncio.create_task(
-        send_periodic_heartbeat(client_id, 30)  # 30 second interval
-    )
+    try:
+        # Scope the heartbeat and writer to this connection: the task group
+        # guarantees they are cancelled and awaited however the loop exits
+        async with asyncio.TaskGroup() as tg:
+            heartbeat_task = tg.create_task(
+                send_periodic_heartbeat(client_id, 30)  # 30 second interval
+            )
+            writer_task = tg.create_task(connection_manager.run_writer(client_id))
+            await handle_client_messages(websocket, client_id, chat_service)
+            heartbeat_task.cancel()
+            writer_task.cancel()
+    finally:
+        await connection_manager.disconnect(client_id)
+
+
+async def handle_client_messages(
+    websocket: WebSocket, client_id: str, chat_service: ChatService
+):
+    """
+    Run the receive/respond loop for a connected WebSocket client.
+
+    Sends the welcome message, then processes incoming messages until the
+    client disconnects or the connection fails. Connection cleanup is left
+    to the caller.
+
+    Args:
+        websocket: WebSocket connection instance
+        client_id: Unique identifier for the client
+        chat_service: Chat service used to generate responses
+    """
+    # Use client_id as conversation_id for simplicity
+    conversation_id = client_id
 
     try:
         # Send welcome message
         welcome_message = {
-            "id": str(uuid.uuid4()),
+            "id": new_message_id(),
             "content": "Hello! I'm your Xfinity support assistant. How can I help you today?",
             "role": "assistant",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utc_now_iso(),
             "agent": "Support Agent",
             "agent_type": "general",
             "answer_type": "welcome",
@@ -490,21 +573,20 @@ async def websocket_endpoint(
 
                 # Wait for message from client
                 try:
-                    data = await websocket.receive_json()
+                    data = orjson.loads(await websocket.receive_text())
                 except RuntimeError as e:
                     if "disconnect" in str(e).lower():
                         logger.info(f"Client {client_id} disconnected during receive")
                         break
                     raise
 
-                logger.info(
-                    f"Received message from client {client_id}: {data.get('content', '')[:50]}..."
-                )
+                _ws_messages_in.inc()
+                logger.debug("Received message from client %s", client_id)
 
                 # Handle heartbeat pong response
                 if data.get("type") == "pong":
                     logger.debug(f"Received heartbeat pong from client {client_id}")
-                    connection_manager.last_heartbeat[client_id] = datetime.utcnow()
+                    connection_manager.last_heartbeat[client_id] = time.monotonic()
                     continue
 
                 # Handle heartbeat ping from client (respond with pong)
@@ -514,7 +596,7 @@ async def websocket_endpoint(
                     )
                     pong_message = {
                         "type": "pong",
-                        "timestamp": datetime.utcnow().isoformat(),
+                        "timestamp": utc_now_iso(),
                     }
                     await connection_manager.send_personal_message(
                         pong_message, client_id
@@ -528,11 +610,13 @@ async def websocket_endpoint(
                     )
                     continue
 
-                # Process message through enhanced AI agent system
-                logger.info(f"Processing message for client {client_id}")
-                agent_response = await chat_service.process_message(
-                    conversation_id, data["content"]
-                )
+                # Process message through enhanced AI agent system; each
+                # message gets its own session, as dependencies don't apply
+                # to the lifetime of a WebSocket loop
+                async with async_session() as db_session:
+                    agent_response = await chat_service.process_message(
+                        conversation_id, data["content"], db_session
+                    )
 
                 # Track conversation metrics
                 if "conversation_metrics" in agent_response:
@@ -551,16 +635,12 @@ async def websocket_endpoint(
                         f"High frustration detected in conversation {client_id}"
                     )
 
-                logger.info(
-                    f"Generated response for client {client_id}: {agent_response.get('answer', '')[:50]}..."
-                )
-
                 # Send AI response back to client with enhanced metadata
                 response_message = {
-                    "id": str(uuid.uuid4()),
+                    "id": new_message_id(),
                     "content": agent_response["answer"],
                     "role": "assistant",
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": utc_now_iso(),
                     "agent": agent_response.get("agent", "Support Agent"),
                     "agent_type": agent_response.get("agent_type", "general"),
                     "answer_type": agent_response.get("answer_type", "kb_response"),
@@ -575,11 +655,9 @@ async def websocket_endpoint(
                     ),
                 }
 
-                logger.info(f"About to send response message: {response_message}")
                 await connection_manager.send_personal_message(
                     response_message, client_id
                 )
-                logger.info(f"Response sent to client {client_id}")
 
             except WebSocketDisconnect:
                 # WebSocket disconnect during receive - break out of loop
@@ -590,30 +668,30 @@ async def websocket_endpoint(
 
             except Exception as e:
                 # Handle message processing errors gracefully
+                error_message = str(e)
                 logger.error(
-                    f"Error processing message for client {client_id}: {str(e)}"
+                    f"Error processing message for client {client_id}: {error_message}"
                 )
 
                 # Check if the error is related to a disconnected WebSocket
-                if "disconnect" in str(e).lower() or "closed" in str(e).lower():
+                if _CONNECTION_LOST_RE.search(error_message):
                     logger.info(f"Client {client_id} connection lost during processing")
                     break
 
                 # Determine appropriate error message
-                error_message = str(e)
-                if "rate limit" in error_message.lower() or "429" in error_message:
+                if _RATE_LIMIT_RE.search(error_message):
                     user_message = "I'm here to help with your Xfinity services. The AI service is temporarily busy, but I can still assist you with information from our knowledge base. What specific issue are you experiencing?"
-                elif "insufficient_quota" in error_message.lower():
+                elif _QUOTA_RE.search(error_message):
                     user_message = "I'm here to help with your Xfinity services. I can assist you with internet issues, billing questions, equipment troubleshooting, and general support. What specific problem are you experiencing?"
                 else:
                     user_message = "I'm here to help with your Xfinity services. What can I assist you with today?"
 
                 # Send error fallback message
                 error_response = {
-                    "id": str(uuid.uuid4()),
+                    "id": new_message_id(),
                     "content": user_message,
                     "role": "assistant",
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": utc_now_iso(),
                     "agent": "Support Agent",
                     "agent_type": "general",
                     "answer_type": "error_fallback",
@@ -621,28 +699,18 @@ async def websocket_endpoint(
                     "intent_data": {},
                 }
 
-                try:
-                    await connection_manager.send_personal_message(
-                        error_response, client_id
-                    )
-                except Exception as send_error:
-                    logger.error(
-                        f"Failed to send error message to client {client_id}: {send_error}"
-                    )
-                    # If we can't send the error message, connection is likely dead
-                    break
+                # Only queued; a dead socket is handled by run_writer
+                await connection_manager.send_personal_message(
+                    error_response, client_id
+                )
 
     except WebSocketDisconnect:
         # Handle client disconnection gracefully
         logger.info(f"Client {client_id} disconnected normally")
-        heartbeat_task.cancel()
-        await connection_manager.disconnect(client_id)
 
     except Exception as e:
         # Handle unexpected errors
         logger.error(f"Unexpected WebSocket error for client {client_id}: {str(e)}")
-        heartbeat_task.cancel()
-        await connection_manager.disconnect(client_id)
 
 
 async def send_periodic_heartbeat(client_id: str, interval: int = 30):
@@ -706,8 +774,5 @@ async def get_websocket_stats():
     """
     return {
         "active_connections": connection_manager.get_connection_count(),
-        "connection_details": {
-            client_id: connection_manager.get_client_metadata(client_id)
-            for client_id in connection_manager.active_connections.keys()
-        },
+        "connection_details": connection_manager.get_metadata_snapshot(),
     }
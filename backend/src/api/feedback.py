@@ -1,15 +1,35 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
-from fastapi.responses import StreamingResponse, JSONResponse
-import csv
-from io import StringIO
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from typing import Optional
+import orjson
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, Query
-from src.config.database import get_db
+from src.config.database import async_session, get_db
 from src.models.feedback_models import Feedback
 
 router = APIRouter()
 
+FEEDBACK_CSV_HEADER = "id,message_id,rating,comment,timestamp\r\n"
+
+# Characters that force a CSV field to be quoted (csv.QUOTE_MINIMAL rules)
+_CSV_SPECIAL = frozenset(',"\r\n')
+
+# Page size for keyset-paginated JSON exports
+FEEDBACK_PAGE_SIZE = 1000
+
+
+def feedback_to_dict(fb: Feedback) -> dict:
+    # orjson serializes datetimes natively, so the timestamp is passed through
+    return {
+        "id": fb.id,
+        "message_id": fb.message_id,
+        "rating": fb.rating,
+        "comment": fb.comment,
+        "timestamp": fb.timestamp,
+    }
+
 
 class FeedbackSchema(BaseModel):
     conversation_id: str = None
@@ -19,13 +39,13 @@ class FeedbackSchema(BaseModel):
 
 
 @router.post("/submit")
-def submit_feedback(feedback: FeedbackSchema):
+async def submit_feedback(feedback: FeedbackSchema):
     # For demo, just acknowledge receipt
     return {"status": "received", "feedback": feedback}
 
 
 @router.post("/")
-def submit_feedback_root(feedback: FeedbackSchema):
+async def submit_feedback_root(feedback: FeedbackSchema):
     # For demo, just acknowledge receipt
     return {"status": "received", "feedback": feedback}
 
@@ -33,31 +53,93 @@ def submit_feedback_root(feedback: FeedbackSchema):
 @router.get("/export")
 async def export_feedback(
     format: str = Query("json", enum=["json", "csv"]),
+    stream: bool = Query(False, description="Stream JSON as NDJSON"),
+    after_id: Optional[int] = Query(None, description="Keyset pagination cursor"),
+    limit: int = Query(
+        FEEDBACK_PAGE_SIZE,
+        ge=1,
+        le=FEEDBACK_PAGE_SIZE,
+        description="Rows per JSON page, including the first",
+    ),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Feedback))
-    feedbacks = result.scalars().all()
+    """
+    Export feedback as CSV, NDJSON or paged JSON.
+
+    CSV and NDJSON stream every row. Plain JSON returns at most limit rows in
+    id order; request the next page with after_id set to the last id
+    returned, until a page comes back shorter than limit.
+    """
     if format == "csv":
-        output = StringIO()
-        writer = csv.writer(output)
-        writer.writerow(["id", "message_id", "rating", "comment", "timestamp"])
-        for fb in feedbacks:
-            writer.writerow([fb.id, fb.message_id, fb.rating, fb.comment, fb.timestamp])
-        output.seek(0)
         return StreamingResponse(
-            output,
+            stream_feedback_csv(),
             media_type="text/csv",
             headers={"Content-Disposition": "attachment; filename=feedback_export.csv"},
         )
+    elif stream:
+        return StreamingResponse(
+            stream_feedback_ndjson(), media_type="application/x-ndjson"
+        )
     else:
-        data = [
-            {
-                "id": fb.id,
-                "message_id": fb.message_id,
-                "rating": fb.rating,
-                "comment": fb.comment,
-                "timestamp": fb.timestamp.isoformat() if fb.timestamp else None,
-            }
-            for fb in feedbacks
-        ]
-        return JSONResponse(content=data)
+        query = select(Feedback).order_by(Feedback.id).limit(limit)
+        if after_id is not None:
+            # Keyset pagination: pass the last id of the previous page
+            query = query.where(Feedback.id > after_id)
+        result = await db.execute(query)
+        data = [feedback_to_dict(fb) for fb in result.scalars()]
+        return ORJSONResponse(content=data)
+
+
+def export_query():
+    """Feedback rows in primary-key order, fetched from the cursor in batches."""
+    return (
+        select(Feedback)
+        .order_by(Feedback.id)
+        .execution_options(yield_per=FEEDBACK_PAGE_SIZE)
+    )
+
+
+async def stream_feedback_csv():
+    """
+    Yield the feedback export as CSV, one row at a time.
+
+    Rows are streamed from the database with a server-side cursor so memory
+    stays bounded regardless of table size, and formatted directly rather
+    than through csv.writer since every column is a simple scalar. The
+    generator opens its own session because request-scoped dependencies are
+    closed before a streaming response body is sent.
+    """
+    yield FEEDBACK_CSV_HEADER
+
+    async with async_session() as session:
+        feedbacks = await session.stream_scalars(export_query())
+        async for fb in feedbacks:
+            yield feedback_to_csv_row(fb)
+
+
+def csv_escape(value) -> str:
+    """Format a field the way csv.writer does with QUOTE_MINIMAL."""
+    if value is None:
+        return ""
+    value = str(value)
+    if _CSV_SPECIAL.isdisjoint(value):
+        return value
+    return '"' + value.replace('"', '""') + '"'
+
+
+def feedback_to_csv_row(fb: Feedback) -> str:
+    # id and rating are integers and never need quoting
+    return (
+        f"{fb.id},{csv_escape(fb.message_id)},{fb.rating},"
+        f"{csv_escape(fb.comment)},{csv_escape(fb.timestamp)}\r\n"
+    )
+
+
+async def stream_feedback_ndjson():
+    """
+    Yield the feedback export as newline-delimited JSON, one row per line.
+    """
+    async with async_session() as session:
+        feedbacks = await session.stream_scalars(export_query())
+        async for fb in feedbacks:
+            yield orjson.dumps(feedback_to_dict(fb)) + b"\n"
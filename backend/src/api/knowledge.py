@@ -1,25 +1,35 @@
 from fastapi import APIRouter, Query, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import os
-import json
-from src.services.semantic_search import SemanticKnowledgeBase
+import orjson
+from src.services.semantic_search import SemanticCache, SemanticKnowledgeBase
 
 router = APIRouter()
 
 # Global instance of the hybrid search engine
 semantic_kb = SemanticKnowledgeBase()
 
+# Semantic cache so repeated and near-duplicate queries skip the vector search
+semantic_cache = SemanticCache(semantic_kb)
+
 # Path to the knowledge base JSON file
 KB_PATH = os.path.join(os.path.dirname(__file__), "../xfinity_knowledge_base.json")
 
+# Parsed knowledge base, reused until the file's modification time changes
+_kb_cache = {"mtime": None, "agents": {}}
+
 
 def load_knowledge_base():
-    with open(KB_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data.get("knowledge_base", {}).get("agents", {})
+    mtime = os.stat(KB_PATH).st_mtime
+    if _kb_cache["mtime"] != mtime:
+        with open(KB_PATH, "rb") as f:
+            data = orjson.loads(f.read())
+        _kb_cache["agents"] = data.get("knowledge_base", {}).get("agents", {})
+        _kb_cache["mtime"] = mtime
+    return _kb_cache["agents"]
 
 
-@router.get("/", response_class=JSONResponse)
+@router.get("/", response_class=ORJSONResponse)
 def get_knowledge_base(
     q: str = Query(None, description="Search query"),
     top_k: int = 5,
@@ -27,14 +37,13 @@ def get_knowledge_base(
     ranking_boosts: str = Query(None, description="JSON dict of ranking boosts"),
 ):
     if not q:
-        # Return all articles (as before, but with new structure)
-        articles = [resp for resp in semantic_kb.responses]
-        return {"articles": articles}
+        # Return all articles from the list built once at startup
+        return {"articles": semantic_kb.responses}
     # Parse filters and ranking_boosts if provided
-    filters_dict = json.loads(filters) if filters else None
-    ranking_boosts_dict = json.loads(ranking_boosts) if ranking_boosts else None
+    filters_dict = orjson.loads(filters) if filters else None
+    ranking_boosts_dict = orjson.loads(ranking_boosts) if ranking_boosts else None
     # Hybrid search with filtering/ranking
-    results = semantic_kb.hybrid_search(
+    results = semantic_cache.hybrid_search(
         q, top_k=top_k, filters=filters_dict, ranking_boosts=ranking_boosts_dict
     )
     # Return results with scores and metadata
@@ -1,5 +1,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
+from uuid import uuid4
 import os
 from dotenv import load_dotenv
 from src.config.settings import settings
@@ -8,14 +10,36 @@ from src.config.settings import settings
 load_dotenv()
 
 # Create async engine with proper connection pooling
+if settings.DATABASE_USE_PGBOUNCER:
+    # PgBouncer owns the pool, so each session takes a fresh client connection.
+    # Transaction pooling hands every transaction to a different server
+    # connection, which breaks asyncpg's prepared statement caches, and
+    # asyncpg's numbered statement names would collide across server
+    # connections, so each statement gets a unique name.
+    engine_options = {
+        "poolclass": NullPool,
+        "connect_args": {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    }
+else:
+    engine_options = {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        # Connections are recycled before server or proxy idle timeouts can
+        # close them, instead of pinging with SELECT 1 on every checkout
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        # Don't specify poolclass for async engines - it uses
+        # AsyncAdaptedQueuePool by default
+    }
+
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=not settings.is_production,  # Disable echo in production
-    pool_size=settings.DATABASE_POOL_SIZE,
-    max_overflow=settings.DATABASE_MAX_OVERFLOW,
-    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
-    pool_pre_ping=True,  # Validate connections before use
-    # Don't specify poolclass for async engines - it uses AsyncAdaptedQueuePool by default
+    echo=settings.DEBUG,  # Log every statement only when debugging
+    **engine_options,
 )
 
 # Create async session factory
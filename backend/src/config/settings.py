@@ -33,23 +33,35 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = 5
     DATABASE_MAX_OVERFLOW: int = 10
     DATABASE_POOL_TIMEOUT: int = 30
+    DATABASE_POOL_RECYCLE: int = 600  # Seconds before a pooled connection is replaced
+    # Set when connecting through PgBouncer in transaction pooling mode
+    DATABASE_USE_PGBOUNCER: bool = False
 
     # Redis Configuration
     REDIS_URL: str = Field(default="redis://localhost:6379/0")
     REDIS_CACHE_TTL: int = 300  # 5 minutes
+    REDIS_MAX_CONNECTIONS: int = 100
+    REDIS_POOL_TIMEOUT: float = 1.0  # Seconds to wait for a free connection
 
     # OpenAI Configuration
     OPENAI_API_KEY: Optional[str] = None
     OPENAI_MODEL: str = "gpt-3.5-turbo"
     OPENAI_TEMPERATURE: float = 0.7
     OPENAI_MAX_TOKENS: int = 1000
+    OPENAI_MAX_CONCURRENCY: int = 8  # In-flight LLM calls per process
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 50
 
     # WebSocket Configuration
     WS_HEARTBEAT_INTERVAL: int = 30
     WS_MAX_CONNECTIONS: int = 1000
+    WS_SEND_QUEUE_SIZE: int = 32  # Pending outbound messages per client
 
     # Monitoring Configuration
     ENABLE_METRICS: bool = True
+    # When set, Prometheus metrics are also served from a separate port by
+    # prometheus_client's own HTTP server, off the application's event loop
+    PROMETHEUS_METRICS_PORT: Optional[int] = None
     ENABLE_TRACING: bool = Field(default=False)
     JAEGER_ENDPOINT: Optional[str] = None
 
@@ -59,6 +71,7 @@ class Settings(BaseSettings):
 
     # CORS Configuration
     CORS_ORIGINS: str = Field(default="http://localhost:3000,http://localhost:5173")
+    CORS_MAX_AGE: int = 86400  # How long browsers may cache preflight responses
 
     @property
     def cors_origins_list(self) -> list:
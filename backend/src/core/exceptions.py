@@ -1,18 +1,41 @@
 from fastapi import HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.exception_handlers import http_exception_handler
 from starlette.exceptions import HTTPException as StarletteHTTPException
+import asyncio
 import logging
 from enum import Enum
-from typing import Any, Dict, Optional
-import traceback
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+import orjson
 import time
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Wall-clock time refreshed every 100 ms by run_timestamp_updater while the app
+# is running. None means the updater isn't running and time.time() is used.
+_cached_timestamp: Optional[float] = None
+
+
+def error_timestamp() -> float:
+    """Timestamp for error responses, accurate to the updater interval."""
+    if _cached_timestamp is None:
+        return time.time()
+    return _cached_timestamp
+
+
+async def run_timestamp_updater(interval: float = 0.1):
+    """Keep the cached error timestamp fresh until cancelled."""
+    global _cached_timestamp
+    try:
+        while True:
+            _cached_timestamp = time.time()
+            await asyncio.sleep(interval)
+    finally:
+        _cached_timestamp = None
+
+
 class ErrorCode(str, Enum):
     """Standardized error codes for the application."""
 
@@ -52,6 +75,9 @@ class ErrorCode(str, Enum):
 class BaseAPIException(Exception):
     """Base exception class for API errors."""
 
+    # Stored in slots so raising doesn't populate a per-instance __dict__
+    __slots__ = ("message", "error_code", "status_code", "details", "timestamp")
+
     def __init__(
         self,
         message: str,
@@ -63,13 +89,15 @@ class BaseAPIException(Exception):
         self.error_code = error_code
         self.status_code = status_code
         self.details = details or {}
-        self.timestamp = time.time()
+        self.timestamp = error_timestamp()
         super().__init__(self.message)
 
 
 class ValidationException(BaseAPIException):
     """Exception for input validation errors."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         message: str = "Invalid input provided",
@@ -86,6 +114,8 @@ class ValidationException(BaseAPIException):
 class AuthenticationException(BaseAPIException):
     """Exception for authentication errors."""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Authentication required"):
         super().__init__(
             message=message, error_code=ErrorCode.UNAUTHORIZED, status_code=401
@@ -95,6 +125,8 @@ class AuthenticationException(BaseAPIException):
 class AuthorizationException(BaseAPIException):
     """Exception for authorization errors."""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Access forbidden"):
         super().__init__(
             message=message, error_code=ErrorCode.FORBIDDEN, status_code=403
@@ -104,6 +136,8 @@ class AuthorizationException(BaseAPIException):
 class RateLimitException(BaseAPIException):
     """Exception for rate limiting."""
 
+    __slots__ = ()
+
     def __init__(
         self, message: str = "Rate limit exceeded", retry_after: Optional[int] = None
     ):
@@ -122,6 +156,8 @@ class RateLimitException(BaseAPIException):
 class DatabaseException(BaseAPIException):
     """Exception for database errors."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         message: str = "Database operation failed",
@@ -138,6 +174,8 @@ class DatabaseException(BaseAPIException):
 class ConversationNotFoundException(BaseAPIException):
     """Exception for conversation not found."""
 
+    __slots__ = ()
+
     def __init__(self, conversation_id: str):
         super().__init__(
             message=f"Conversation {conversation_id} not found",
@@ -150,6 +188,8 @@ class ConversationNotFoundException(BaseAPIException):
 class ExternalServiceException(BaseAPIException):
     """Exception for external service errors."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         service_name: str,
@@ -170,6 +210,8 @@ class ExternalServiceException(BaseAPIException):
 class OpenAIException(ExternalServiceException):
     """Exception for OpenAI API errors."""
 
+    __slots__ = ()
+
     def __init__(
         self, message: str = "OpenAI API error", api_error_code: Optional[str] = None
     ):
@@ -193,25 +235,76 @@ class ErrorResponse:
         """Format error response in consistent structure."""
         return {
             "error": {
-                "code": error_code.value,
+                # ErrorCode is a str enum, which orjson encodes as its value
+                "code": error_code,
                 "message": message,
                 "details": details or {},
-                "timestamp": timestamp or time.time(),
+                "timestamp": timestamp or error_timestamp(),
             },
             "success": False,
         }
 
 
+def _error_envelope_parts(error_code: ErrorCode, message: str) -> Tuple[bytes, bytes]:
+    """
+    Pre-encode a detail-free error envelope, split around its timestamp.
+
+    Joining the two halves around an encoded timestamp gives the same bytes
+    as encoding ErrorResponse.format_error(error_code, message).
+    """
+    head = orjson.dumps({"code": error_code.value, "message": message, "details": {}})
+    return b'{"error":' + head[:-1] + b',"timestamp":', b'},"success":false}'
+
+
+def _static_error_response(parts: Tuple[bytes, bytes], status_code: int) -> Response:
+    """Build an error response from pre-encoded envelope parts."""
+    head, tail = parts
+    return Response(
+        content=head + orjson.dumps(error_timestamp()) + tail,
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+# Map HTTP status codes to error codes
+HTTP_ERROR_CODES = {
+    400: ErrorCode.MALFORMED_REQUEST,
+    401: ErrorCode.UNAUTHORIZED,
+    403: ErrorCode.FORBIDDEN,
+    404: ErrorCode.RECORD_NOT_FOUND,
+    429: ErrorCode.RATE_LIMIT_EXCEEDED,
+    500: ErrorCode.INTERNAL_SERVER_ERROR,
+    503: ErrorCode.SERVICE_UNAVAILABLE,
+}
+
+# Pre-encoded bodies for HTTP errors raised with their default detail
+# (the standard reason phrase), keyed by status code
+_STATIC_HTTP_ERRORS = {
+    status: (
+        HTTPStatus(status).phrase,
+        _error_envelope_parts(code, HTTPStatus(status).phrase),
+    )
+    for status, code in HTTP_ERROR_CODES.items()
+}
+
+_UNEXPECTED_ERROR = _error_envelope_parts(
+    ErrorCode.INTERNAL_SERVER_ERROR, "An unexpected error occurred"
+)
+
+
 # Global exception handlers
 async def api_exception_handler(
     request: Request, exc: BaseAPIException
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Handle custom API exceptions."""
     # Log the exception
+    error_code = exc.error_code.value
     logger.error(
-        f"API Exception: {exc.error_code.value} - {exc.message}",
+        "API Exception: %s - %s",
+        error_code,
+        exc.message,
         extra={
-            "error_code": exc.error_code.value,
+            "error_code": error_code,
             "status_code": exc.status_code,
             "details": exc.details,
             "path": request.url.path,
@@ -219,7 +312,7 @@ async def api_exception_handler(
         },
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=ErrorResponse.format_error(
             error_code=exc.error_code,
@@ -232,11 +325,11 @@ async def api_exception_handler(
 
 async def validation_exception_handler(
     request: Request, exc: Exception
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Handle Pydantic validation exceptions."""
     logger.warning(f"Validation error: {str(exc)}", extra={"path": request.url.path})
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content=ErrorResponse.format_error(
             error_code=ErrorCode.VALIDATION_ERROR,
@@ -248,29 +341,21 @@ async def validation_exception_handler(
 
 async def http_exception_handler_custom(
     request: Request, exc: StarletteHTTPException
-) -> JSONResponse:
+) -> Response:
     """Handle HTTP exceptions with consistent format."""
     logger.warning(
         f"HTTP Exception: {exc.status_code} - {exc.detail}",
         extra={"path": request.url.path, "method": request.method},
     )
 
-    # Map HTTP status codes to error codes
-    error_code_mapping = {
-        400: ErrorCode.MALFORMED_REQUEST,
-        401: ErrorCode.UNAUTHORIZED,
-        403: ErrorCode.FORBIDDEN,
-        404: ErrorCode.RECORD_NOT_FOUND,
-        429: ErrorCode.RATE_LIMIT_EXCEEDED,
-        500: ErrorCode.INTERNAL_SERVER_ERROR,
-        503: ErrorCode.SERVICE_UNAVAILABLE,
-    }
-
-    error_code = error_code_mapping.get(
-        exc.status_code, ErrorCode.INTERNAL_SERVER_ERROR
-    )
+    # Common errors raised with their default detail use a pre-encoded body
+    static = _STATIC_HTTP_ERRORS.get(exc.status_code)
+    if static is not None and exc.detail == static[0]:
+        return _static_error_response(static[1], exc.status_code)
 
-    return JSONResponse(
+    error_code = HTTP_ERROR_CODES.get(exc.status_code, ErrorCode.INTERNAL_SERVER_ERROR)
+
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=ErrorResponse.format_error(
             error_code=error_code,
@@ -279,64 +364,53 @@ async def http_exception_handler_custom(
     )
 
 
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> Response:
     """Handle unexpected exceptions."""
-    # Log the full traceback for debugging
+    # Log the full traceback for debugging; exc_info defers formatting to
+    # the logging machinery, so it only happens if the record is emitted
     logger.error(
-        f"Unexpected error: {str(exc)}",
-        extra={
-            "path": request.url.path,
-            "method": request.method,
-            "traceback": traceback.format_exc(),
-        },
+        "Unexpected error: %s",
+        exc,
+        exc_info=exc,
+        extra={"path": request.url.path, "method": request.method},
     )
 
-    return JSONResponse(
-        status_code=500,
-        content=ErrorResponse.format_error(
-            error_code=ErrorCode.INTERNAL_SERVER_ERROR,
-            message="An unexpected error occurred",
-        ),
-    )
+    return _static_error_response(_UNEXPECTED_ERROR, 500)
 
 
 # Exception raising utilities
-class ExceptionRaiser:
-    """Utility class for raising common exceptions."""
+def require_auth(condition: bool, message: str = "Authentication required"):
+    """Raise authentication exception if condition is False."""
+    if not condition:
+        raise AuthenticationException(message)
 
-    @staticmethod
-    def require_auth(condition: bool, message: str = "Authentication required"):
-        """Raise authentication exception if condition is False."""
-        if not condition:
-            raise AuthenticationException(message)
 
-    @staticmethod
-    def require_permission(condition: bool, message: str = "Access forbidden"):
-        """Raise authorization exception if condition is False."""
-        if not condition:
-            raise AuthorizationException(message)
+def require_permission(condition: bool, message: str = "Access forbidden"):
+    """Raise authorization exception if condition is False."""
+    if not condition:
+        raise AuthorizationException(message)
 
-    @staticmethod
-    def validate_input(
-        condition: bool, message: str, field_errors: Optional[Dict[str, str]] = None
-    ):
-        """Raise validation exception if condition is False."""
-        if not condition:
-            raise ValidationException(message, field_errors)
 
-    @staticmethod
-    def check_not_found(obj: Any, identifier: str, resource_type: str = "Resource"):
-        """Raise not found exception if object is None."""
-        if obj is None:
-            raise BaseAPIException(
-                message=f"{resource_type} {identifier} not found",
-                error_code=ErrorCode.RECORD_NOT_FOUND,
-                status_code=404,
-                details={"identifier": identifier, "resource_type": resource_type},
-            )
+def validate_input(
+    condition: bool, message: str, field_errors: Optional[Dict[str, str]] = None
+):
+    """Raise validation exception if condition is False."""
+    if not condition:
+        raise ValidationException(message, field_errors)
 
-    @staticmethod
-    def check_rate_limit(condition: bool, retry_after: Optional[int] = None):
-        """Raise rate limit exception if condition is False."""
-        if not condition:
-            raise RateLimitException(retry_after=retry_after)
+
+def check_not_found(obj: Any, identifier: str, resource_type: str = "Resource"):
+    """Raise not found exception if object is None."""
+    if obj is None:
+        raise BaseAPIException(
+            message=f"{resource_type} {identifier} not found",
+            error_code=ErrorCode.RECORD_NOT_FOUND,
+            status_code=404,
+            details={"identifier": identifier, "resource_type": resource_type},
+        )
+
+
+def check_rate_limit(condition: bool, retry_after: Optional[int] = None):
+    """Raise rate limit exception if condition is False."""
+    if not condition:
+        raise RateLimitException(retry_after=retry_after)
@@ -25,15 +25,39 @@ load_dotenv()
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import uvicorn
 import logging
-from prometheus_client import make_asgi_app
+import logging.handlers
+import queue
+from prometheus_client import make_asgi_app, start_http_server
 from pydantic import ValidationError
 
+# Configure structured logging for production monitoring
+# This setup ensures consistent log formatting across the application
+# with timestamps, log levels, and module names for better debugging.
+# Records are handed to a queue and written to stderr by a listener thread,
+# so logging calls never block the event loop on I/O. It is configured
+# before the application modules are imported so their startup logs use it.
+_log_queue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+)
+log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
+logging.basicConfig(
+    level=logging.INFO,
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
+    force=True,
+)
+log_listener.start()
+
 # Import configuration and exception handling
 from src.config.settings import settings
+from src.services.llm_client import close_openai_http_client
 from src.core.exceptions import (
     BaseAPIException,
     ValidationException,
@@ -41,19 +65,24 @@ from src.core.exceptions import (
     validation_exception_handler,
     http_exception_handler_custom,
     general_exception_handler,
+    run_timestamp_updater,
 )
 
 # Import all API routers for different functional areas
 from src.api import chat, analytics, feedback, knowledge, profile, auth, metrics
 
-# Configure structured logging for production monitoring
-# This setup ensures consistent log formatting across the application
-# with timestamps, log levels, and module names for better debugging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
+# Use uvloop's libuv-based event loop when it is installed (it ships with
+# uvicorn[standard]). Socket-heavy workloads such as the chat WebSocket get
+# noticeably cheaper per-frame I/O; stock asyncio is used otherwise.
+try:
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    logger.info("uvloop not installed, using the default asyncio event loop")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -79,10 +108,32 @@ async def lifespan(app: FastAPI):
     # - Set up Redis connections for caching
     # - Initialize background task queues
 
+    # Build the shared chat service now so the first request doesn't pay for
+    # loading the knowledge base and intent models
+    chat.get_chat_service()
+
+    # Serve metrics from a dedicated port so scrapes skip the ASGI app
+    if settings.PROMETHEUS_METRICS_PORT:
+        try:
+            start_http_server(settings.PROMETHEUS_METRICS_PORT)
+        except OSError as e:
+            # Another worker in this pod already serves the port
+            logger.warning(f"Metrics server not started: {str(e)}")
+
+    # Refresh the cached timestamp used by error responses
+    timestamp_task = asyncio.create_task(run_timestamp_updater())
+
     yield  # Application runs here
 
     # Shutdown phase - cleanup resources
     logger.info("Shutting down application...")
+    timestamp_task.cancel()
+    # Wait for its finally block to reset the cached timestamp
+    with suppress(asyncio.CancelledError):
+        await timestamp_task
+    await close_openai_http_client()
+    # Flush queued log records and stop the listener thread
+    log_listener.stop()
     # TODO: Close database connections, cleanup resources, etc.
     # Example shutdown tasks:
     # - Close database connection pools
@@ -99,6 +150,7 @@ app = FastAPI(
     version=settings.VERSION,
     lifespan=lifespan,
     debug=settings.DEBUG,
+    default_response_class=ORJSONResponse,  # orjson is much faster than stdlib json
 )
 
 # Add exception handlers for standardized error responses
@@ -109,6 +161,8 @@ app.add_exception_handler(Exception, general_exception_handler)
 # Mount Prometheus metrics endpoint for monitoring
 # This provides real-time metrics that can be scraped by monitoring systems
 # to track API performance, request volumes, error rates, etc.
+# Deployments that set PROMETHEUS_METRICS_PORT should scrape that port
+# instead, which keeps scrapes off the event loop and middleware stack.
 app.mount("/metrics", make_asgi_app())
 
 # Configure CORS (Cross-Origin Resource Sharing) middleware
@@ -118,8 +172,11 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins_list,  # Use configured origins as list
     allow_credentials=True,  # Allow cookies and authentication headers
-    allow_methods=["*"],  # Allow all HTTP methods (GET, POST, PUT, DELETE, etc.)
-    allow_headers=["*"],  # Allow all headers including custom ones
+    # Explicit lists instead of wildcards, so preflights aren't answered by
+    # reflecting whatever the browser asked for
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["authorization", "content-type", "x-request-id"],
+    max_age=settings.CORS_MAX_AGE,  # Let browsers cache preflight responses
 )
 
 # Register API routers with versioned prefixes and tags
@@ -169,7 +226,7 @@ async def health_check():
 
 
 @app.get("/api/v1/health")
-def health():
+async def health():
     """
     Versioned health check endpoint for API-specific monitoring.
 
@@ -5,8 +5,15 @@ Compatible with FastAPI 0.115.0 and Pydantic 2.10.2
 """
 
 import jwt
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import asyncio
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Optional, Dict, Any, List
 from fastapi import HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from passlib.context import CryptContext
@@ -22,6 +29,21 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # JWT token scheme compatible with FastAPI 0.115.0
 token_scheme = HTTPBearer()
 
+# Successful password verifications are remembered briefly so repeated logins
+# with the same credentials skip the bcrypt work factor
+PASSWORD_CACHE_SIZE = 1024
+PASSWORD_CACHE_TTL_SECONDS = 60
+
+# Decoded token payloads are reused for a short while so every request on a
+# protected route doesn't redo the signature check and JSON parse
+TOKEN_CACHE_SIZE = 4096
+TOKEN_CACHE_TTL_SECONDS = 30
+
+# A user's AgentAuth connections are reused for a few seconds so bursts of
+# authenticated requests don't each call out to Composio
+CONNECTIONS_CACHE_SIZE = 10_000
+CONNECTIONS_CACHE_TTL_SECONDS = 10
+
 
 class AuthenticationError(Exception):
     """Custom exception for authentication errors."""
@@ -43,13 +65,34 @@ class AgentAuthMiddleware:
         self.access_token_expire_minutes = (
             agent_auth_settings.jwt_access_token_expire_minutes
         )
+        # Decoder bound to the key and algorithm once; PyJWT verifies "exp"
+        # itself and rejects tokens without one
+        self._decode = partial(
+            jwt.decode,
+            key=self.secret_key,
+            algorithms=[self.algorithm],
+            options={"require": ["exp"]},
+        )
+        # Keyed digest of (password, hash) -> expiry time (time.monotonic()).
+        # The random per-process key means cache entries can't be used to
+        # brute-force passwords offline.
+        self._verified_passwords: "OrderedDict[bytes, float]" = OrderedDict()
+        self._verified_passwords_key = secrets.token_bytes(32)
+        self._verified_passwords_lock = threading.Lock()
+        # Digest of token -> (payload, cache expiry time (time.monotonic()))
+        self._verified_tokens: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._verified_tokens_lock = threading.Lock()
+        # user_id -> (connections, cache expiry time (time.monotonic())), plus
+        # the in-flight lookup per user so concurrent misses share one call
+        self._user_connections: "OrderedDict[str, tuple]" = OrderedDict()
+        self._pending_connections: Dict[str, asyncio.Task] = {}
 
     def create_access_token(
         self, data: Dict[str, Any], expires_delta: Optional[timedelta] = None
     ) -> str:
         """
         Create JWT access token for user authentication.
-        Compatible with python-jose[cryptography]==3.3.0.
+        Compatible with PyJWT==2.8.0.
 
         Args:
             data: Payload data to encode in the token
@@ -60,14 +103,13 @@ class AgentAuthMiddleware:
         """
         to_encode = data.copy()
 
+        now = datetime.now(timezone.utc)
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + expires_delta
         else:
-            expire = datetime.utcnow() + timedelta(
-                minutes=self.access_token_expire_minutes
-            )
+            expire = now + timedelta(minutes=self.access_token_expire_minutes)
 
-        to_encode.update({"exp": expire, "iat": datetime.utcnow()})
+        to_encode.update({"exp": expire, "iat": now})
 
         try:
             encoded_jwt = jwt.encode(
@@ -81,7 +123,7 @@ class AgentAuthMiddleware:
     def verify_token(self, token: str) -> Dict[str, Any]:
         """
         Verify and decode JWT token.
-        Compatible with python-jose[cryptography]==3.3.0.
+        Compatible with PyJWT==2.8.0.
 
         Args:
             token: JWT token to verify
@@ -92,24 +134,38 @@ class AgentAuthMiddleware:
         Raises:
             AuthenticationError: If token is invalid or expired
         """
-        try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-
-            # Check if token is expired
-            exp = payload.get("exp")
-            if exp and datetime.fromtimestamp(exp) < datetime.utcnow():
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        now = time.monotonic()
+
+        with self._verified_tokens_lock:
+            cached = self._verified_tokens.get(cache_key)
+            if cached is not None and cached[1] > now:
+                payload = cached[0]
+                # The token's own expiry still applies to cached payloads
+                if payload["exp"] > time.time():
+                    self._verified_tokens.move_to_end(cache_key)
+                    return payload
+                del self._verified_tokens[cache_key]
                 raise AuthenticationError("Token has expired")
 
-            return payload
+        try:
+            payload = self._decode(token)
 
         except jwt.ExpiredSignatureError:
             raise AuthenticationError("Token has expired")
-        except jwt.JWTError:
+        except jwt.InvalidTokenError:
             raise AuthenticationError("Invalid token")
         except Exception as e:
             logger.error(f"Token verification error: {str(e)}")
             raise AuthenticationError("Token verification failed")
 
+        with self._verified_tokens_lock:
+            self._verified_tokens[cache_key] = (payload, now + TOKEN_CACHE_TTL_SECONDS)
+            self._verified_tokens.move_to_end(cache_key)
+            if len(self._verified_tokens) > TOKEN_CACHE_SIZE:
+                self._verified_tokens.popitem(last=False)
+        return payload
+
     async def get_current_user(
         self, credentials: HTTPAuthorizationCredentials
     ) -> Dict[str, Any]:
@@ -127,22 +183,7 @@ class AgentAuthMiddleware:
             HTTPException: If authentication fails
         """
         try:
-            payload = self.verify_token(credentials.credentials)
-            user_id = payload.get("user_id")
-
-            if not user_id:
-                raise AuthenticationError("Invalid token payload")
-
-            # Get user's AgentAuth connections
-            connections = await agent_auth_manager.get_user_connections(user_id)
-
-            return {
-                "user_id": user_id,
-                "email": payload.get("email"),
-                "name": payload.get("name"),
-                "connections": connections,
-                "is_authenticated": True,
-            }
+            return await self.get_user_from_token(credentials.credentials)
 
         except AuthenticationError as e:
             raise HTTPException(
@@ -151,13 +192,93 @@ class AgentAuthMiddleware:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+    async def get_user_from_token(self, token: str) -> Dict[str, Any]:
+        """
+        Get user information from a raw bearer token.
+
+        Raises:
+            AuthenticationError: If the token is invalid or has no user_id
+        """
+        payload = self.verify_token(token)
+        user_id = payload.get("user_id")
+
+        if not user_id:
+            raise AuthenticationError("Invalid token payload")
+
+        # Get user's AgentAuth connections
+        connections = await self._get_user_connections(user_id)
+
+        return {
+            "user_id": user_id,
+            "email": payload.get("email"),
+            "name": payload.get("name"),
+            "connections": connections,
+            "is_authenticated": True,
+        }
+
+    async def _get_user_connections(self, user_id: str) -> List[Dict[str, Any]]:
+        """Get a user's AgentAuth connections, cached briefly per user."""
+        cached = self._user_connections.get(user_id)
+        if cached is not None and cached[1] > time.monotonic():
+            self._user_connections.move_to_end(user_id)
+            return cached[0]
+
+        task = self._pending_connections.get(user_id)
+        if task is None:
+            task = asyncio.create_task(agent_auth_manager.get_user_connections(user_id))
+            task.add_done_callback(partial(self._store_user_connections, user_id))
+            self._pending_connections[user_id] = task
+
+        # Shielded so one cancelled request doesn't cancel the shared lookup
+        return await asyncio.shield(task)
+
+    def _store_user_connections(self, user_id: str, task: asyncio.Task) -> None:
+        """Cache the result of a finished connections lookup."""
+        self._pending_connections.pop(user_id, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        self._user_connections[user_id] = (
+            task.result(),
+            time.monotonic() + CONNECTIONS_CACHE_TTL_SECONDS,
+        )
+        self._user_connections.move_to_end(user_id)
+        if len(self._user_connections) > CONNECTIONS_CACHE_SIZE:
+            self._user_connections.popitem(last=False)
+
     def hash_password(self, password: str) -> str:
         """Hash password for storage using passlib[bcrypt]==1.7.4."""
         return pwd_context.hash(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Verify password against hash using passlib[bcrypt]==1.7.4."""
-        return pwd_context.verify(plain_password, hashed_password)
+        """
+        Verify password against hash using passlib[bcrypt]==1.7.4.
+
+        Only successful verifications are cached, so failed attempts always pay
+        the full bcrypt cost.
+        """
+        cache_key = hashlib.blake2b(
+            plain_password.encode() + b"\0" + hashed_password.encode(),
+            key=self._verified_passwords_key,
+            digest_size=16,
+        ).digest()
+        now = time.monotonic()
+
+        with self._verified_passwords_lock:
+            expires_at = self._verified_passwords.get(cache_key)
+            if expires_at is not None and expires_at > now:
+                self._verified_passwords.move_to_end(cache_key)
+                return True
+
+        if not pwd_context.verify(plain_password, hashed_password):
+            return False
+
+        with self._verified_passwords_lock:
+            self._verified_passwords[cache_key] = now + PASSWORD_CACHE_TTL_SECONDS
+            self._verified_passwords.move_to_end(cache_key)
+            if len(self._verified_passwords) > PASSWORD_CACHE_SIZE:
+                self._verified_passwords.popitem(last=False)
+        return True
 
 
 # Global middleware instance
@@ -177,12 +298,10 @@ async def get_current_user_optional(request: Request) -> Optional[Dict[str, Any]
     """FastAPI dependency for optional authentication compatible with FastAPI 0.115.0."""
     auth_header = request.headers.get("Authorization")
 
-    if not auth_header or not auth_header.startswith("Bearer "):
+    if not auth_header or auth_header[:7] != "Bearer ":
         return None
 
     try:
-        token = auth_header.split(" ")[1]
-        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
-        return await auth_middleware.get_current_user(credentials)
-    except HTTPException:
+        return await auth_middleware.get_user_from_token(auth_header[7:])
+    except AuthenticationError:
         return None
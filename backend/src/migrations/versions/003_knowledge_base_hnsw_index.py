@@ -0,0 +1,43 @@
+"""Switch the knowledge base embedding index from IVFFlat to HNSW
+
+Revision ID: 003_knowledge_base_hnsw_index
+Revises: 002_create_auth_tables
+Create Date: 2026-10-16 09:00:00.000000
+
+The IVFFlat index was built with a fixed lists = 100 and queried at the
+default of one probe, which gives poor recall on 1536-dim embeddings. HNSW
+(pgvector >= 0.5.0) gives better recall at the same speed and needs no
+retraining as rows are added. Queries against it can trade speed for
+recall with ``SET LOCAL hnsw.ef_search = 40`` (the default is 40).
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "003_knowledge_base_hnsw_index"
+down_revision = "002_create_auth_tables"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Replace the IVFFlat embedding index with an HNSW index."""
+    op.execute("DROP INDEX IF EXISTS knowledge_base_embedding_idx")
+    op.execute(
+        """
+        CREATE INDEX knowledge_base_embedding_idx ON knowledge_base
+        USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)
+    """
+    )
+
+
+def downgrade() -> None:
+    """Restore the original IVFFlat embedding index."""
+    op.execute("DROP INDEX IF EXISTS knowledge_base_embedding_idx")
+    op.execute(
+        """
+        CREATE INDEX knowledge_base_embedding_idx ON knowledge_base
+        USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100)
+    """
+    )
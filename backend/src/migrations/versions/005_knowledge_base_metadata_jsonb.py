@@ -0,0 +1,45 @@
+"""Store knowledge base metadata as JSONB
+
+Revision ID: 005_knowledge_base_metadata_jsonb
+Revises: 003_knowledge_base_hnsw_index
+Create Date: 2026-10-16 10:00:00.000000
+
+JSON columns keep the raw text and are reparsed on every read; JSONB stores
+the parsed form, which the model already declares. The conversation and
+message columns are converted in database/alembic, where those tables live.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "005_knowledge_base_metadata_jsonb"
+down_revision = "003_knowledge_base_hnsw_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Convert knowledge_base.metadata to JSONB."""
+    op.alter_column(
+        "knowledge_base",
+        "metadata",
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_type=postgresql.JSON(astext_type=sa.Text()),
+        existing_nullable=True,
+        postgresql_using="metadata::jsonb",
+    )
+
+
+def downgrade() -> None:
+    """Convert knowledge_base.metadata back to JSON."""
+    op.alter_column(
+        "knowledge_base",
+        "metadata",
+        type_=postgresql.JSON(astext_type=sa.Text()),
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        existing_nullable=True,
+        postgresql_using="metadata::json",
+    )
@@ -0,0 +1,40 @@
+"""Generate UUID primary keys in the database
+
+Revision ID: 006_server_side_uuid_defaults
+Revises: 005_knowledge_base_metadata_jsonb
+Create Date: 2026-10-16 10:30:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "006_server_side_uuid_defaults"
+down_revision = "005_knowledge_base_metadata_jsonb"
+branch_labels = None
+depends_on = None
+
+UUID_KEYED_TABLES = [
+    "conversations",
+    "messages",
+    "knowledge_base",
+    "users",
+    "agent_connections",
+]
+
+
+def upgrade() -> None:
+    """Default each UUID primary key to gen_random_uuid()."""
+    # gen_random_uuid() is built in from PostgreSQL 13; pgcrypto provides it
+    # on older servers
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+
+    for table in UUID_KEYED_TABLES:
+        op.alter_column(table, "id", server_default=sa.text("gen_random_uuid()"))
+
+
+def downgrade() -> None:
+    """Remove the server-side UUID defaults."""
+    for table in UUID_KEYED_TABLES:
+        op.alter_column(table, "id", server_default=None)
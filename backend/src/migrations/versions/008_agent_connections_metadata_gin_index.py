@@ -0,0 +1,38 @@
+"""Index AgentConnection auth metadata for containment queries
+
+Revision ID: 008_agent_connections_metadata_gin_index
+Revises: 006_server_side_uuid_defaults
+Create Date: 2026-10-16 12:00:00.000000
+
+jsonb_path_ops only supports @> style containment, but is about half the
+size of the default jsonb_ops index and faster for those lookups. Filters on
+these columns should be written as containment, e.g.
+``auth_metadata @> '{"provider": "github"}'``.
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "008_agent_connections_metadata_gin_index"
+down_revision = "006_server_side_uuid_defaults"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add a jsonb_path_ops GIN index on agent_connections.auth_metadata."""
+    op.create_index(
+        "ix_agent_connections_auth_metadata_gin",
+        "agent_connections",
+        ["auth_metadata"],
+        postgresql_using="gin",
+        postgresql_ops={"auth_metadata": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Drop the auth metadata GIN index."""
+    op.drop_index(
+        "ix_agent_connections_auth_metadata_gin", table_name="agent_connections"
+    )
@@ -0,0 +1,33 @@
+"""Index the provider key of AgentConnection auth metadata
+
+Revision ID: 009_agent_connections_provider_index
+Revises: 008_agent_connections_metadata_gin_index
+Create Date: 2026-10-16 12:30:00.000000
+
+->> isn't a GIN operator, so auth_metadata->>'provider' = ? filters can't
+use the GIN index and need a B-tree expression index of their own.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "009_agent_connections_provider_index"
+down_revision = "008_agent_connections_metadata_gin_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add a B-tree index on auth_metadata->>'provider'."""
+    op.create_index(
+        "ix_agent_connections_provider",
+        "agent_connections",
+        [sa.text("(auth_metadata->>'provider')")],
+    )
+
+
+def downgrade() -> None:
+    """Drop the provider expression index."""
+    op.drop_index("ix_agent_connections_provider", table_name="agent_connections")
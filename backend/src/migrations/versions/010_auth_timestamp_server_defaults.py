@@ -0,0 +1,35 @@
+"""Default auth table timestamps in the database
+
+Revision ID: 010_auth_timestamp_server_defaults
+Revises: 009_agent_connections_provider_index
+Create Date: 2026-10-16 13:30:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "010_auth_timestamp_server_defaults"
+down_revision = "009_agent_connections_provider_index"
+branch_labels = None
+depends_on = None
+
+TIMESTAMP_COLUMNS = [
+    ("users", "created_at"),
+    ("users", "updated_at"),
+    ("agent_connections", "created_at"),
+    ("agent_connections", "updated_at"),
+]
+
+
+def upgrade() -> None:
+    """Default the naive UTC timestamp columns to the database's UTC now()."""
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, server_default=sa.text("timezone('utc', now())"))
+
+
+def downgrade() -> None:
+    """Remove the timestamp server defaults."""
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, server_default=None)
@@ -0,0 +1,94 @@
+"""Backfill the messages table from the inline conversations.messages column
+
+Revision ID: 012_backfill_messages_from_conversations
+Revises: 010_auth_timestamp_server_defaults
+Create Date: 2026-10-16 14:30:00.000000
+
+First half of the add-backfill-drop move from the inline JSON array to the
+messages table; 013 drops the column once this has run. Conversations are
+walked in primary key order, one committed batch at a time, so no long lock
+is held and the migration can be stopped and rerun safely: a conversation's
+array is emptied in the same statement that copies it.
+
+The inline column only exists in this tree's schema, which is why the move
+lives here rather than in database/alembic.
+
+"""
+
+import time
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "012_backfill_messages_from_conversations"
+down_revision = "010_auth_timestamp_server_defaults"
+branch_labels = None
+depends_on = None
+
+# Conversations moved per batch, and the pause between batches that leaves
+# room for application traffic
+BATCH_SIZE = 1000
+BATCH_PAUSE_SECONDS = 0.1
+
+# Each array element becomes one message. Ordinality keeps the original
+# order by spacing created_at one microsecond apart from the conversation's
+# creation time; the element itself is kept as the message metadata.
+# Batches page by id > :last_id, so each one starts where the previous one
+# stopped instead of rescanning from the start. FOR UPDATE waits for rows
+# locked by application traffic rather than skipping them, so a batch never
+# comes back short while unmoved rows remain. The statement returns the last
+# id it handled, or no row once the walk is done.
+BACKFILL_BATCH = sa.text(
+    """
+    WITH batch AS (
+        SELECT id, messages, created_at
+        FROM conversations
+        WHERE id > :last_id AND json_array_length(messages) > 0
+        ORDER BY id
+        LIMIT :batch_size
+        FOR UPDATE
+    ),
+    moved AS (
+        INSERT INTO messages (conversation_id, sender, content, metadata, created_at)
+        SELECT
+            batch.id,
+            COALESCE(m.value->>'sender', m.value->>'role', 'user'),
+            COALESCE(m.value->>'content', ''),
+            m.value,
+            COALESCE(batch.created_at, now())
+                + m.ordinality * interval '1 microsecond'
+        FROM batch, json_array_elements(batch.messages) WITH ORDINALITY AS m
+    ),
+    emptied AS (
+        UPDATE conversations
+        SET messages = '[]'
+        FROM batch
+        WHERE conversations.id = batch.id
+    )
+    SELECT id FROM batch ORDER BY id DESC LIMIT 1
+    """
+)
+
+# Sorts before every other UUID, so the first batch starts at the beginning
+FIRST_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def upgrade() -> None:
+    """Copy inline messages into the messages table, one batch at a time."""
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        last_id = FIRST_ID
+        while True:
+            handled = bind.execute(
+                BACKFILL_BATCH, {"last_id": last_id, "batch_size": BATCH_SIZE}
+            ).scalar()
+            if handled is None:
+                break
+            last_id = str(handled)
+            time.sleep(BATCH_PAUSE_SECONDS)
+
+
+def downgrade() -> None:
+    """Nothing to undo; the backfilled messages stay in the messages table."""
+    pass
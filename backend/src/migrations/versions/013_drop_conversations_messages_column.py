@@ -0,0 +1,51 @@
+"""Drop the inline conversations.messages column
+
+Revision ID: 013_drop_conversations_messages_column
+Revises: 012_backfill_messages_from_conversations
+Create Date: 2026-10-16 14:30:00.000000
+
+Final step of the add-backfill-drop move; 012 has already copied every
+inline message into the messages table. The column is only dropped once no
+conversation still holds inline messages. Dropping a column only updates the
+catalog, so the exclusive lock is brief.
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "013_drop_conversations_messages_column"
+down_revision = "012_backfill_messages_from_conversations"
+branch_labels = None
+depends_on = None
+
+
+REMAINING_INLINE = sa.text(
+    "SELECT count(*) FROM conversations WHERE json_array_length(messages) > 0"
+)
+
+
+def upgrade() -> None:
+    """Drop conversations.messages once 012 has emptied every array."""
+    remaining = op.get_bind().execute(REMAINING_INLINE).scalar()
+    if remaining:
+        raise RuntimeError(
+            f"{remaining} conversations still hold inline messages; "
+            "rerun 012_backfill_messages_from_conversations before dropping"
+        )
+    op.drop_column("conversations", "messages")
+
+
+def downgrade() -> None:
+    """Restore conversations.messages as an empty array per conversation."""
+    op.add_column(
+        "conversations",
+        sa.Column(
+            "messages",
+            postgresql.JSON(astext_type=sa.Text()),
+            nullable=False,
+            server_default=sa.text("'[]'::json"),
+        ),
+    )
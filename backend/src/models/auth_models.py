@@ -4,16 +4,27 @@ Database Models for Authentication and AgentAuth Integration
 Compatible with SQLAlchemy 2.0.35 and Pydantic 2.10.2
 """
 
-from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, Integer
+from sqlalchemy import (
+    Column,
+    String,
+    Boolean,
+    DateTime,
+    Text,
+    ForeignKey,
+    Index,
+    Integer,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-import uuid
+from src.config.database import Base
 
-Base = declarative_base()
+# These timestamp columns are naive UTC, so the database's now() is converted
+# to UTC rather than stored in the server's time zone
+UTC_NOW = text("timezone('utc', now())")
 
 
 class User(Base):
@@ -21,14 +32,16 @@ class User(Base):
 
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     email = Column(String(255), unique=True, index=True, nullable=False)
     name = Column(String(255), nullable=False)
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, onupdate=UTC_NOW)
 
     # Relationship to AgentAuth connections
     agent_connections = relationship("AgentConnection", back_populates="user")
@@ -39,7 +52,9 @@ class AgentConnection(Base):
 
     __tablename__ = "agent_connections"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     app_name = Column(String(100), nullable=False)
     connection_id = Column(String(255), unique=True, nullable=False)
@@ -48,12 +63,24 @@ class AgentConnection(Base):
         String(50), default="pending"
     )  # pending, connected, failed, disconnected
     auth_metadata = Column(JSONB)  # Store additional auth data
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW)
+    updated_at = Column(DateTime, server_default=UTC_NOW, onupdate=UTC_NOW)
 
     # Relationship to user
     user = relationship("User", back_populates="agent_connections")
 
+    __table_args__ = (
+        # Containment (@>) lookups on auth_metadata
+        Index(
+            "ix_agent_connections_auth_metadata_gin",
+            auth_metadata,
+            postgresql_using="gin",
+            postgresql_ops={"auth_metadata": "jsonb_path_ops"},
+        ),
+        # auth_metadata->>'provider' = ? filters
+        Index("ix_agent_connections_provider", text("(auth_metadata->>'provider')")),
+    )
+
 
 # Pydantic models compatible with Pydantic 2.10.2
 
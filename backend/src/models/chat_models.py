@@ -1,33 +1,63 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Text
-from sqlalchemy.sql import func
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
-import uuid
+from sqlalchemy import (
+    Column,
+    Integer,
+    Float,
+    String,
+    DateTime,
+    ForeignKey,
+    Index,
+    Text,
+)
+from sqlalchemy.sql import func, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import deferred, relationship
 from src.config.database import Base
 
 
 class Conversation(Base):
     __tablename__ = "conversations"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     user_id = Column(String(255), nullable=False)
     session_id = Column(String(255), unique=True, nullable=False)
+    # Never loaded implicitly: an unplanned access raises instead of issuing a
+    # query per conversation. Load it with selectinload(Conversation.messages).
     messages = relationship(
-        "Message", back_populates="conversation", cascade="all, delete-orphan"
+        "Message",
+        back_populates="conversation",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        order_by="Message.created_at",
     )
     status = Column(String(50), default="active")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_conversations_user_updated", user_id, updated_at.desc()),
+        Index(
+            "ix_conversations_active_user_updated",
+            user_id,
+            updated_at.desc(),
+            postgresql_where=text("status = 'active'"),
+        ),
+    )
+
 
 class Message(Base):
     __tablename__ = "messages"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     conversation_id = Column(UUID(as_uuid=True), ForeignKey("conversations.id"))
     sender = Column(String(50), nullable=False)  # 'user' or 'agent'
     content = Column(Text, nullable=False)
-    meta = Column(JSON, nullable=True)
+    # The JSONB blobs aren't needed to render a thread, so they're only loaded
+    # when a query asks for them with undefer()
+    meta = deferred(Column(JSONB, nullable=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     role = Column(String, nullable=False)  # 'user' or 'assistant'
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
@@ -35,5 +65,24 @@ class Message(Base):
     agent_type = Column(String, nullable=True)
     answer_type = Column(String, nullable=True)
     intent = Column(String, nullable=True)
-    intent_data = Column(JSON, nullable=True)
+    intent_data = deferred(Column(JSONB, nullable=True))
+    # Copied out of intent_data at insert time so analytics can filter and
+    # aggregate it as a plain column
+    confidence = Column(Float, nullable=True)
     conversation = relationship("Conversation", back_populates="messages")
+
+    __table_args__ = (
+        # Postgres scans this backwards for ORDER BY created_at DESC
+        Index("ix_messages_conversation_created", conversation_id, created_at),
+        # Key existence (?) and containment (@>) lookups on meta
+        Index("ix_messages_meta_gin", meta, postgresql_using="gin"),
+        # Containment (@>) lookups on intent_data
+        Index(
+            "ix_messages_intent_data_gin",
+            intent_data,
+            postgresql_using="gin",
+            postgresql_ops={"intent_data": "jsonb_path_ops"},
+        ),
+        # intent_data->>'intent' = ? filters
+        Index("ix_messages_intent", text("(intent_data->>'intent')")),
+    )
@@ -6,7 +6,7 @@ from src.config.database import Base
 class Feedback(Base):
     __tablename__ = "feedback"
     id = Column(Integer, primary_key=True, index=True)
-    message_id = Column(String, nullable=False)
+    message_id = Column(String, nullable=False, index=True)
     rating = Column(Integer, nullable=False)
     comment = Column(Text, nullable=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
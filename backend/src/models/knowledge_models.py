@@ -1,20 +1,21 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Text
-from sqlalchemy.sql import func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy.sql import func, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from pgvector.sqlalchemy import Vector
-import uuid
 from ..config.database import Base
 
 
 class KnowledgeBase(Base):
     __tablename__ = "knowledge_base"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
     category = Column(String(100), nullable=True)
     embedding = Column(Vector(1536), nullable=False)  # OpenAI embedding dimension
-    meta_data = Column(JSON, nullable=True)
+    meta_data = Column(JSONB, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
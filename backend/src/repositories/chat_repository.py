@@ -1,14 +1,101 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from sqlalchemy import desc
-from typing import List, Optional
+from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy import bindparam, desc, insert, or_, true, tuple_, update
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 from uuid import UUID
 import uuid
 
 from src.models.chat_models import Conversation, Message
 
 
+def _maybe_uuid(value: str) -> Optional[UUID]:
+    """Parse value as a UUID, or return None if it isn't one."""
+    try:
+        return UUID(value)
+    except ValueError:
+        return None
+
+
+def _promote_intent_fields(row: dict) -> dict:
+    """Copy the scalar fields analytics query out of intent_data into columns."""
+    intent_data = row.get("intent_data")
+    if "confidence" in row or not isinstance(intent_data, dict):
+        return row
+
+    confidence = intent_data.get("confidence")
+    if isinstance(confidence, (int, float)) and not isinstance(confidence, bool):
+        return {**row, "confidence": float(confidence)}
+    return row
+
+
+# Statements for the hot lookups, built once at import. Values are passed as
+# bind parameters at execute time, so each call skips statement construction
+# and hits the compiled SQL cache directly.
+_CONVERSATION_BY_SESSION = select(Conversation).where(
+    Conversation.session_id == bindparam("session_id")
+)
+# A session_id match sorts ahead of a primary key match
+_CONVERSATION_BY_SESSION_OR_ID = (
+    select(Conversation)
+    .where(
+        or_(
+            Conversation.session_id == bindparam("session_id"),
+            Conversation.id == bindparam("conversation_pk"),
+        )
+    )
+    .order_by(Conversation.session_id != bindparam("session_id"))
+    .limit(1)
+)
+_CONVERSATION_PK_BY_SESSION = select(Conversation.id).where(
+    Conversation.session_id == bindparam("session_id")
+)
+# A session_id match sorts ahead of a primary key match
+_CONVERSATION_PK_BY_SESSION_OR_ID = (
+    select(Conversation.id)
+    .where(
+        or_(
+            Conversation.session_id == bindparam("session_id"),
+            Conversation.id == bindparam("conversation_pk"),
+        )
+    )
+    .order_by(Conversation.session_id != bindparam("session_id"))
+    .limit(1)
+)
+_MESSAGES_NEWEST = (
+    select(Message)
+    .where(Message.conversation_id == bindparam("conversation_pk"))
+    .order_by(desc(Message.created_at), desc(Message.id))
+    .limit(bindparam("limit"))
+)
+_MESSAGES_BEFORE = _MESSAGES_NEWEST.where(
+    tuple_(Message.created_at, Message.id)
+    < tuple_(
+        bindparam("before_created_at", type_=Message.created_at.type),
+        bindparam("before_id", type_=Message.id.type),
+    )
+)
+# Each of a user's recent conversations with its newest message (or None),
+# fetched through a LATERAL join instead of one messages query per row
+_LAST_MESSAGE = aliased(
+    Message,
+    select(Message)
+    .where(Message.conversation_id == Conversation.id)
+    .order_by(desc(Message.created_at), desc(Message.id))
+    .limit(1)
+    .lateral("last_message"),
+)
+_USER_CONVERSATIONS_WITH_LAST_MESSAGE = (
+    select(Conversation, _LAST_MESSAGE)
+    .outerjoin(_LAST_MESSAGE, true())
+    .where(Conversation.user_id == bindparam("user_id"))
+    .order_by(desc(Conversation.updated_at))
+    .limit(bindparam("limit"))
+)
+
+
 class ChatRepository:
     """Repository for chat-related database operations."""
 
@@ -22,47 +109,98 @@ class ChatRepository:
         if not session_id:
             session_id = str(uuid.uuid4())
 
-        conversation = Conversation(
-            user_id=user_id, session_id=session_id, status="active"
+        # RETURNING brings back the server-generated id and created_at, so no
+        # refresh SELECT is needed after the commit
+        result = await self.db.execute(
+            insert(Conversation)
+            .values(user_id=user_id, session_id=session_id, status="active")
+            .returning(Conversation)
         )
-        self.db.add(conversation)
+        conversation = result.scalar_one()
         await self.db.commit()
-        await self.db.refresh(conversation)
         return conversation
 
     async def get_conversation(self, conversation_id: str) -> Optional[Conversation]:
-        """Get conversation by ID or session_id."""
-        # Try by session_id first
-        result = await self.db.execute(
-            select(Conversation)
-            .options(selectinload(Conversation.messages))
-            .where(Conversation.session_id == conversation_id)
+        """Get conversation by ID or session_id, without its messages."""
+        return await self._get_conversation(conversation_id)
+
+    async def get_conversation_with_messages(
+        self, conversation_id: str
+    ) -> Optional[Conversation]:
+        """Get conversation by ID or session_id with its messages loaded."""
+        return await self._get_conversation(
+            conversation_id, selectinload(Conversation.messages)
         )
-        conversation = result.scalar_one_or_none()
 
-        if not conversation:
-            # Try by UUID if session_id failed
-            try:
-                uuid_id = UUID(conversation_id)
-                result = await self.db.execute(
-                    select(Conversation)
-                    .options(selectinload(Conversation.messages))
-                    .where(Conversation.id == uuid_id)
-                )
-                conversation = result.scalar_one_or_none()
-            except ValueError:
-                pass
+    async def _get_conversation(
+        self, conversation_id: str, *options
+    ) -> Optional[Conversation]:
+        """
+        Look a conversation up by session_id, or by UUID, in one query.
 
-        return conversation
+        Only values shaped like a UUID can be primary keys, so anything else
+        is matched on session_id alone. Session ids may be UUIDs too, so a
+        UUID-shaped value matches either column, preferring session_id.
+        """
+        uuid_id = _maybe_uuid(conversation_id)
+        if uuid_id is None:
+            stmt = _CONVERSATION_BY_SESSION
+            params = {"session_id": conversation_id}
+        else:
+            stmt = _CONVERSATION_BY_SESSION_OR_ID
+            params = {"session_id": conversation_id, "conversation_pk": uuid_id}
+
+        if options:
+            stmt = stmt.options(*options)
+
+        result = await self.db.execute(stmt, params)
+        return result.scalar_one_or_none()
+
+    async def _resolve_conversation_pk(self, conversation_id: str) -> Optional[UUID]:
+        """
+        Get a conversation's primary key by session_id or UUID in one query.
+
+        Only the id column is selected, so no conversation or message rows are
+        loaded. A session_id match wins over a primary key match.
+        """
+        uuid_id = _maybe_uuid(conversation_id)
+        if uuid_id is None:
+            result = await self.db.execute(
+                _CONVERSATION_PK_BY_SESSION, {"session_id": conversation_id}
+            )
+        else:
+            result = await self.db.execute(
+                _CONVERSATION_PK_BY_SESSION_OR_ID,
+                {"session_id": conversation_id, "conversation_pk": uuid_id},
+            )
+        return result.scalar_one_or_none()
 
     async def get_or_create_conversation(
         self, conversation_id: str, user_id: str = "anonymous"
     ) -> Conversation:
-        """Get existing conversation or create new one."""
-        conversation = await self.get_conversation(conversation_id)
-        if not conversation:
-            conversation = await self.create_conversation(user_id, conversation_id)
-        return conversation
+        """
+        Get existing conversation or create new one.
+
+        INSERT ... ON CONFLICT (session_id) DO NOTHING, so concurrent callers
+        can't race between the lookup and the insert, and an existing row is
+        never rewritten. RETURNING is empty on conflict; the existing row is
+        then read by its session_id.
+        """
+        result = await self.db.execute(
+            pg_insert(Conversation)
+            .values(user_id=user_id, session_id=conversation_id, status="active")
+            .on_conflict_do_nothing(index_elements=[Conversation.session_id])
+            .returning(Conversation)
+        )
+        conversation = result.scalar_one_or_none()
+        if conversation is not None:
+            await self.db.commit()
+            return conversation
+
+        result = await self.db.execute(
+            _CONVERSATION_BY_SESSION, {"session_id": conversation_id}
+        )
+        return result.scalar_one()
 
     async def add_message(
         self,
@@ -78,65 +216,140 @@ class ChatRepository:
         meta: dict = None,
     ) -> Message:
         """Add a message to a conversation."""
-        conversation = await self.get_conversation(conversation_id)
-        if not conversation:
+        conversation_pk = await self._resolve_conversation_pk(conversation_id)
+        if conversation_pk is None:
             raise ValueError(f"Conversation {conversation_id} not found")
 
-        message = Message(
-            conversation_id=conversation.id,
-            content=content,
-            sender=sender,
-            role=role,
-            agent=agent,
-            agent_type=agent_type,
-            answer_type=answer_type,
-            intent=intent,
-            intent_data=intent_data,
-            meta=meta,
+        messages = await self.add_messages(
+            conversation_pk,
+            [
+                {
+                    "content": content,
+                    "sender": sender,
+                    "role": role,
+                    "agent": agent,
+                    "agent_type": agent_type,
+                    "answer_type": answer_type,
+                    "intent": intent,
+                    "intent_data": intent_data,
+                    "meta": meta,
+                }
+            ],
         )
-        self.db.add(message)
-        await self.db.commit()
-        await self.db.refresh(message)
-        return message
+        return messages[0]
 
-    async def get_conversation_messages(
-        self, conversation_id: str, limit: int = 50, offset: int = 0
+    async def add_messages(
+        self, conversation_pk: UUID, rows: List[dict]
     ) -> List[Message]:
-        """Get messages for a conversation with pagination."""
-        conversation = await self.get_conversation(conversation_id)
-        if not conversation:
+        """
+        Insert several messages into a conversation with one statement.
+
+        Rows are dicts of Message column values. Keys missing from a row are
+        stored as NULL, so every row shares one INSERT and one commit. Rows
+        should carry their own created_at/timestamp; any that don't are
+        stamped a microsecond apart in list order, since the server default
+        would give every row of the transaction the same now().
+        """
+        if not rows:
             return []
 
+        now = datetime.now(timezone.utc)
+        rows = [
+            _promote_intent_fields(
+                {
+                    "created_at": now + timedelta(microseconds=i),
+                    "timestamp": now + timedelta(microseconds=i),
+                    **row,
+                }
+            )
+            for i, row in enumerate(rows)
+        ]
+        columns = {key for row in rows for key in row}
+        params = [
+            {
+                **{key: row.get(key) for key in columns},
+                "conversation_id": conversation_pk,
+            }
+            for row in rows
+        ]
         result = await self.db.execute(
-            select(Message)
-            .where(Message.conversation_id == conversation.id)
-            .order_by(desc(Message.created_at))
-            .limit(limit)
-            .offset(offset)
+            insert(Message).returning(Message, sort_by_parameter_order=True), params
         )
+        messages = list(result.scalars().all())
+        await self.db.commit()
+        return messages
+
+    async def get_conversation_messages(
+        self,
+        conversation_id: str,
+        limit: int = 50,
+        before: Optional[Tuple[datetime, UUID]] = None,
+    ) -> Tuple[List[Message], Optional[Tuple[datetime, UUID]]]:
+        """
+        Get a page of messages for a conversation, newest page first.
+
+        Uses keyset pagination: pass the cursor returned with one page as
+        `before` to get the page of older messages. The cursor is the oldest
+        message's (created_at, id); the id breaks ties between messages
+        stored in the same transaction. It is None once there are no more
+        pages.
+        """
+        conversation_pk = await self._resolve_conversation_pk(conversation_id)
+        if conversation_pk is None:
+            return [], None
+
+        params = {"conversation_pk": conversation_pk, "limit": limit}
+        if before is None:
+            result = await self.db.execute(_MESSAGES_NEWEST, params)
+        else:
+            params["before_created_at"], params["before_id"] = before
+            result = await self.db.execute(_MESSAGES_BEFORE, params)
         messages = result.scalars().all()
-        return list(reversed(messages))  # Return in chronological order
+
+        next_cursor = None
+        if len(messages) == limit:
+            next_cursor = (messages[-1].created_at, messages[-1].id)
+        return list(reversed(messages)), next_cursor  # Chronological order
 
     async def update_conversation_status(
         self, conversation_id: str, status: str
     ) -> bool:
-        """Update conversation status."""
-        conversation = await self.get_conversation(conversation_id)
-        if not conversation:
-            return False
+        """Update conversation status with a single UPDATE, without loading it."""
+        uuid_id = _maybe_uuid(conversation_id)
+        match = Conversation.session_id == conversation_id
+        if uuid_id is not None:
+            match = or_(match, Conversation.id == uuid_id)
 
-        conversation.status = status
+        result = await self.db.execute(
+            update(Conversation).where(match).values(status=status)
+        )
         await self.db.commit()
-        return True
+        return result.rowcount > 0
 
     async def get_user_conversations(
-        self, user_id: str, limit: int = 10
+        self, user_id: str, limit: int = 10, active_only: bool = False
     ) -> List[Conversation]:
-        """Get user's recent conversations."""
+        """Get user's recent conversations, optionally only the active ones."""
+        stmt = select(Conversation).where(Conversation.user_id == user_id)
+        if active_only:
+            stmt = stmt.where(Conversation.status == "active")
+
         result = await self.db.execute(
-            select(Conversation)
-            .where(Conversation.user_id == user_id)
-            .order_by(desc(Conversation.updated_at))
-            .limit(limit)
+            stmt.order_by(desc(Conversation.updated_at)).limit(limit)
         )
         return result.scalars().all()
+
+    async def get_user_conversations_with_last_message(
+        self, user_id: str, limit: int = 10
+    ) -> List[Tuple[Conversation, Optional[Message]]]:
+        """
+        Get user's recent conversations, each paired with its newest message.
+
+        One query for the whole list; the message is None for conversations
+        that have none yet.
+        """
+        result = await self.db.execute(
+            _USER_CONVERSATIONS_WITH_LAST_MESSAGE,
+            {"user_id": user_id, "limit": limit},
+        )
+        return [(conversation, message) for conversation, message in result.all()]
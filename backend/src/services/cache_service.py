@@ -1,5 +1,6 @@
 import redis.asyncio as redis
-import json
+import hashlib
+import orjson
 import pickle
 from typing import Any, Optional, Union
 from src.config.settings import settings
@@ -7,6 +8,37 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Keys fetched per SCAN call and removed per UNLINK in clear_pattern
+CLEAR_PATTERN_BATCH_SIZE = 500
+
+# One-byte prefixes recording how a cached value was serialized
+JSON_TAG = b"J"
+PICKLE_TAG = b"P"
+
+
+def _serialize(value: Any) -> bytes:
+    """Serialize a value as tagged JSON, falling back to pickle."""
+    try:
+        return JSON_TAG + orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        return PICKLE_TAG + pickle.dumps(value, protocol=5)
+
+
+_LOADERS = {JSON_TAG: orjson.loads, PICKLE_TAG: pickle.loads}
+
+
+def _deserialize(value: bytes) -> Any:
+    """Decode a value written by _serialize, or untagged JSON/text."""
+    loader = _LOADERS.get(value[:1])
+    if loader is not None:
+        return loader(value[1:])
+
+    # Counters from increment and entries written before tagging
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return value.decode("utf-8", errors="replace")
+
 
 class CacheService:
     """Redis-based caching service for improved performance."""
@@ -20,15 +52,20 @@ class CacheService:
     def _initialize_redis(self):
         """Initialize Redis connection with error handling."""
         try:
-            self.redis_client = redis.from_url(
+            # Bounded pool: under bursts callers wait up to REDIS_POOL_TIMEOUT
+            # for a free connection instead of opening new sockets. Values are
+            # stored as tagged bytes, so responses stay undecoded.
+            pool = redis.BlockingConnectionPool.from_url(
                 settings.REDIS_URL,
-                encoding="utf-8",
-                decode_responses=True,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT,
+                decode_responses=False,
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 retry_on_timeout=True,
                 health_check_interval=30,
             )
+            self.redis_client = redis.Redis(connection_pool=pool)
             self.is_available = True
             logger.info("Redis cache service initialized successfully")
         except Exception as e:
@@ -56,14 +93,7 @@ class CacheService:
             if value is None:
                 return default
 
-            # Try to parse as JSON first, then as pickle
-            try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
-                try:
-                    return pickle.loads(value.encode("utf-8"))
-                except:
-                    return value
+            return _deserialize(value)
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
             return default
@@ -73,7 +103,6 @@ class CacheService:
         key: str,
         value: Any,
         ttl: Optional[int] = None,
-        serialize_json: bool = True,
     ) -> bool:
         """
         Set value in cache.
@@ -82,7 +111,6 @@ class CacheService:
             key: Cache key
             value: Value to cache
             ttl: Time to live in seconds (None for default TTL)
-            serialize_json: Whether to serialize as JSON (vs pickle)
 
         Returns:
             True if successful, False otherwise
@@ -91,19 +119,8 @@ class CacheService:
             return False
 
         try:
-            # Serialize value
-            if serialize_json:
-                try:
-                    serialized_value = json.dumps(value)
-                except (TypeError, ValueError):
-                    # Fallback to pickle for complex objects
-                    serialized_value = pickle.dumps(value).decode("utf-8")
-            else:
-                serialized_value = pickle.dumps(value).decode("utf-8")
-
-            # Set with TTL
             ttl = ttl or settings.REDIS_CACHE_TTL
-            await self.redis_client.setex(key, ttl, serialized_value)
+            await self.redis_client.setex(key, ttl, _serialize(value))
             return True
 
         except Exception as e:
@@ -168,13 +185,15 @@ class CacheService:
             return None
 
         try:
-            # Increment the value
-            new_value = await self.redis_client.incrby(key, amount)
-
-            # Set TTL if this is a new key
-            if new_value == amount and ttl:
-                await self.redis_client.expire(key, ttl)
-
+            if not ttl:
+                return await self.redis_client.incrby(key, amount)
+
+            # Seed a missing key at 0 with its TTL, then increment, in one
+            # round-trip; existing counters keep their expiry
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.set(key, 0, ex=ttl, nx=True)
+            pipe.incrby(key, amount)
+            _, new_value = await pipe.execute()
             return new_value
         except Exception as e:
             logger.error(f"Cache increment error for key {key}: {e}")
@@ -195,20 +214,11 @@ class CacheService:
 
         try:
             values = await self.redis_client.mget(keys)
-            result = {}
-
-            for i, key in enumerate(keys):
-                value = values[i]
-                if value is not None:
-                    try:
-                        result[key] = json.loads(value)
-                    except (json.JSONDecodeError, TypeError):
-                        try:
-                            result[key] = pickle.loads(value.encode("utf-8"))
-                        except:
-                            result[key] = value
-
-            return result
+            return {
+                key: _deserialize(value)
+                for key, value in zip(keys, values)
+                if value is not None
+            }
         except Exception as e:
             logger.error(f"Cache get_many error for keys {keys}: {e}")
             return {}
@@ -228,29 +238,102 @@ class CacheService:
             return False
 
         try:
-            # Serialize all values
-            serialized_mapping = {}
-            for key, value in mapping.items():
-                try:
-                    serialized_mapping[key] = json.dumps(value)
-                except (TypeError, ValueError):
-                    serialized_mapping[key] = pickle.dumps(value).decode("utf-8")
-
-            # Set all values
-            await self.redis_client.mset(serialized_mapping)
-
-            # Set TTL for all keys if specified
-            if ttl:
-                pipe = self.redis_client.pipeline()
-                for key in mapping.keys():
-                    pipe.expire(key, ttl)
-                await pipe.execute()
+            serialized_mapping = {
+                key: _serialize(value) for key, value in mapping.items()
+            }
+
+            if not ttl:
+                await self.redis_client.mset(serialized_mapping)
+                return True
+
+            # SET ... EX per key in one pipeline, so values and TTLs land in a
+            # single round-trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, serialized_value in serialized_mapping.items():
+                pipe.set(key, serialized_value, ex=ttl)
+            await pipe.execute()
 
             return True
         except Exception as e:
             logger.error(f"Cache set_many error: {e}")
             return False
 
+    async def push_to_list(
+        self, key: str, values: list, max_length: int, ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Append values to a list, keeping only the newest max_length entries.
+
+        Args:
+            key: Cache key
+            values: JSON-serializable values to append
+            max_length: Maximum number of entries kept in the list
+            ttl: Time to live in seconds, refreshed on every push
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.is_available or not values:
+            return False
+
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.rpush(key, *[orjson.dumps(value) for value in values])
+            pipe.ltrim(key, -max_length, -1)
+            if ttl:
+                pipe.expire(key, ttl)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Cache push_to_list error for key {key}: {e}")
+            return False
+
+    async def get_list(self, key: str) -> list:
+        """
+        Get every entry of a list written by push_to_list.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            List of deserialized values, empty if missing or on error
+        """
+        if not self.is_available:
+            return []
+
+        try:
+            values = await self.redis_client.lrange(key, 0, -1)
+            return [orjson.loads(value) for value in values]
+        except Exception as e:
+            logger.error(f"Cache get_list error for key {key}: {e}")
+            return []
+
+    async def add_to_set(self, key: str, *members: str, ttl: Optional[int] = None):
+        """
+        Add members to a set.
+
+        Args:
+            key: Cache key
+            members: Set members to add
+            ttl: Time to live in seconds, refreshed on every add
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.is_available or not members:
+            return False
+
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.sadd(key, *members)
+            if ttl:
+                pipe.expire(key, ttl)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Cache add_to_set error for key {key}: {e}")
+            return False
+
     async def clear_pattern(self, pattern: str) -> int:
         """
         Clear all keys matching a pattern.
@@ -265,11 +348,20 @@ class CacheService:
             return 0
 
         try:
-            keys = await self.redis_client.keys(pattern)
-            if keys:
-                await self.redis_client.delete(*keys)
-                return len(keys)
-            return 0
+            # SCAN walks the keyspace incrementally instead of blocking Redis
+            # like KEYS, and UNLINK frees the values off the main thread
+            deleted = 0
+            batch = []
+            async for key in self.redis_client.scan_iter(
+                match=pattern, count=CLEAR_PATTERN_BATCH_SIZE
+            ):
+                batch.append(key)
+                if len(batch) >= CLEAR_PATTERN_BATCH_SIZE:
+                    deleted += await self.redis_client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.redis_client.unlink(*batch)
+            return deleted
         except Exception as e:
             logger.error(f"Cache clear_pattern error for pattern {pattern}: {e}")
             return 0
@@ -314,7 +406,12 @@ class CacheService:
     async def close(self):
         """Close Redis connection."""
         if self.redis_client:
-            await self.redis_client.close()
+            await self.redis_client.aclose(close_connection_pool=True)
+
+
+def _stable_hash(text: str) -> str:
+    """Digest text identically in every process, unlike the salted hash()."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
 
 
 # Cache key helpers
@@ -326,16 +423,26 @@ class CacheKeys:
         """Generate cache key for conversation history."""
         return f"chat:conversation:{conversation_id}:history"
 
+    @staticmethod
+    def conversation_recent(conversation_id: str) -> str:
+        """Generate cache key for the recent-turns window of a conversation."""
+        return f"chat:{conversation_id}:recent"
+
+    @staticmethod
+    def conversation_index() -> str:
+        """Generate cache key for the set of stored conversation IDs."""
+        return "chat:index"
+
     @staticmethod
     def knowledge_base_search(query: str, agent: str) -> str:
         """Generate cache key for knowledge base search."""
-        query_hash = hash(query.lower().strip())
+        query_hash = _stable_hash(query.lower().strip())
         return f"kb:search:{agent}:{query_hash}"
 
     @staticmethod
     def intent_classification(message: str) -> str:
         """Generate cache key for intent classification."""
-        message_hash = hash(message.lower().strip())
+        message_hash = _stable_hash(message.lower().strip())
         return f"intent:classify:{message_hash}"
 
     @staticmethod
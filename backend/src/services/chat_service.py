@@ -33,27 +33,198 @@ The service follows an enhanced coordinator pattern where incoming messages are:
 7. Returned with full context, metadata, and flow information
 """
 
-import json
+import asyncio
+import functools
+import orjson
+import random
 import time
 import uuid
 import logging
 import re
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from collections import Counter, OrderedDict
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+from datetime import datetime, timezone
 from enum import Enum
 from dataclasses import dataclass
 
-from langchain.memory import ConversationBufferMemory
-from langchain.chains import ConversationChain
-from langchain.schema import BaseMessage, HumanMessage, AIMessage
-from langchain_openai import ChatOpenAI
+import numpy as np
+from openai import AsyncOpenAI
 
+from src.config.settings import settings
+from src.services.cache_service import CacheKeys, cache_service
 from src.services.intent_service import IntentService
+from src.services.llm_client import get_openai_http_client
 from src.repositories.chat_repository import ChatRepository
 from src.config.database import get_db
 
 logger = logging.getLogger(__name__)
 
+# Number of recent exchanges kept in LLM context and in the shared Redis store
+CONVERSATION_WINDOW_TURNS = 10
+
+# Conversations untouched for this long expire from Redis
+CONVERSATION_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Agents with at least this many KB responses score keyword matches with
+# NumPy; below it a Counter over the few matches is faster
+VECTORIZED_SCORING_MIN_RESPONSES = 64
+
+# Serialized conversation records keep LangChain's role names ("human"/"ai"),
+# which clients and the Redis turn store already use
+RECORD_ROLES = {"user": "human", "assistant": "ai"}
+
+# Conversations whose state is kept in process memory; the least recently
+# used are dropped beyond this and restored from Redis when they next get a
+# message
+MAX_ACTIVE_CONVERSATIONS = 1024
+
+# Agents whose knowledge bases are tried, in order, when the routed agent's
+# has no match
+KB_FALLBACK_ORDER = ("tech_support", "billing", "general")
+
+# Runs of "!" or "?" read as a sign of frustration
+_REPEATED_PUNCTUATION_RE = re.compile(r"[!?]{2,}")
+
+# Characters dropped when normalizing text for knowledge base matching
+_NORMALIZE_RE = re.compile(r"[^a-z0-9 ]")
+
+
+@functools.lru_cache(maxsize=8192)
+def normalize(text: str) -> str:
+    """
+    Normalize text for consistent matching across the knowledge base.
+
+    This function standardizes text by:
+    - Converting to lowercase
+    - Removing punctuation and special characters
+    - Converting underscores to spaces
+    - Stripping whitespace
+
+    Args:
+        text: Raw text to normalize
+
+    Returns:
+        str: Normalized text suitable for matching
+    """
+    return _NORMALIZE_RE.sub("", text.lower().replace("_", " ")).strip()
+
+
+@functools.lru_cache(maxsize=8192)
+def tokenize(text: str) -> frozenset:
+    """
+    Tokenize normalized text into a set of unique words.
+
+    This creates a set of tokens that can be used for overlap-based
+    matching between user queries and knowledge base entries. The set is
+    frozen because results are cached and shared between callers.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        frozenset: Unique tokens from the text
+    """
+    return frozenset(normalize(text).split())
+
+
+def _keyword_matcher(
+    keywords: Tuple[str, ...]
+) -> Tuple[re.Pattern, Dict[str, frozenset]]:
+    """
+    Compile keywords into one pattern that finds them in a single scan.
+
+    The zero-width lookahead tries every position, and longest-first
+    alternatives make each hit the longest keyword starting there. Any
+    other keyword starting at that position is a prefix of it, so mapping
+    each hit to the keywords it contains recovers every keyword present.
+    """
+    alternatives = "|".join(
+        re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)
+    )
+    contained = {
+        keyword: frozenset(other for other in keywords if other in keyword)
+        for keyword in keywords
+    }
+    return re.compile(f"(?=({alternatives}))"), contained
+
+
+def _count_keywords(matcher: Tuple[re.Pattern, Dict[str, frozenset]], text: str) -> int:
+    """Count the distinct keywords of a matcher that occur in text."""
+    pattern, contained = matcher
+    found = set()
+    for hit in set(pattern.findall(text)):
+        found |= contained[hit]
+    return len(found)
+
+
+# Keywords routing a message to tech support or billing when the intent
+# service is unavailable
+_TECH_KEYWORD_MATCHER = _keyword_matcher(
+    (
+        "internet",
+        "wifi",
+        "modem",
+        "router",
+        "connection",
+        "slow",
+        "outage",
+        "not working",
+        "down",
+        "offline",
+        "reset",
+        "restart",
+        "troubleshoot",
+        "technical",
+        "equipment",
+        "cable",
+        "signal",
+        "speed",
+    )
+)
+_BILLING_KEYWORD_MATCHER = _keyword_matcher(
+    (
+        "bill",
+        "billing",
+        "payment",
+        "charge",
+        "cost",
+        "price",
+        "fee",
+        "account",
+        "subscription",
+        "plan",
+        "upgrade",
+        "downgrade",
+        "cancel",
+        "refund",
+        "credit",
+        "balance",
+        "due",
+        "overdue",
+        "autopay",
+    )
+)
+
+
+def new_message_id() -> str:
+    """
+    Generate a time-ordered UUIDv7 string for a chat message.
+
+    The leading 48 bits are the Unix time in milliseconds, so IDs sort by
+    creation time. The random bits come from the module PRNG rather than
+    os.urandom: message IDs need to be unique, not unpredictable.
+    """
+    ms = time.time_ns() // 1_000_000
+    rand = random.getrandbits(74)
+    value = (
+        (ms << 80)
+        | (0x7 << 76)  # version 7
+        | ((rand >> 62) << 64)  # 12 random bits
+        | (0b10 << 62)  # RFC 4122 variant
+        | (rand & ((1 << 62) - 1))  # 62 random bits
+    )
+    return str(uuid.UUID(int=value))
+
 
 class ConversationState(Enum):
     INITIAL = "initial"
@@ -80,6 +251,34 @@ class ConversationContext:
             self.resolution_attempts = []
 
 
+@dataclass
+class _Conversation:
+    """LLM state of one conversation: its system prompt and message history."""
+
+    # Fixed for the life of the conversation so the request prefix never changes
+    system_prompt: str
+    # Every exchange, as OpenAI chat messages ({"role": ..., "content": ...})
+    messages: List[Dict[str, str]]
+
+
+@dataclass
+class _AgentKBIndex:
+    """Lookup tables over one agent's knowledge base, built once at startup."""
+
+    # (normalized name, first response or None) per category, in KB order
+    categories: List[Tuple[str, Optional[Dict]]]
+    # Token -> indexes of the categories whose name contains it
+    category_postings: Dict[str, List[int]]
+    # Every response of the agent, in KB order
+    responses: List[Dict]
+    # Token -> ids of the keywords containing it
+    keyword_postings: Dict[str, List[int]]
+    # Keyword id -> index in responses of the response it belongs to
+    keyword_responses: List[int]
+    # keyword_responses as an array, for agents scored with NumPy
+    keyword_responses_array: Optional[np.ndarray] = None
+
+
 class ChatService:
     """
     Enhanced Chat Service with natural conversational flow, follow-up handling,
@@ -93,7 +292,7 @@ class ChatService:
     - Response formatting and metadata with flow information
     - Frustration level monitoring and empathetic responses
 
-    The service maintains separate conversation chains for each session
+    The service maintains a separate message history for each session
     to preserve context across multiple message exchanges, while also
     tracking conversation quality metrics for business intelligence.
     """
@@ -110,9 +309,33 @@ class ChatService:
         - Follow-up detection patterns
         - Tone-specific prompt templates
         """
-        # Dictionary to store active conversation chains by session ID
+        # Session IDs with state in this process, least recently used first.
+        # Every per-conversation store below is evicted through this one LRU.
+        self._active_conversations: "OrderedDict[str, None]" = OrderedDict()
+
+        # Active conversations by session ID
         # This allows for persistent conversation context across messages
-        self.conversations: Dict[str, ConversationChain] = {}
+        self.conversations: Dict[str, _Conversation] = {}
+
+        # Serialized conversation payloads for the listing endpoints, keyed by
+        # session ID. Message IDs and timestamps are assigned once when a
+        # message is first recorded so they stay stable across reads.
+        self._conversation_cache: Dict[str, Dict[str, Any]] = {}
+
+        # Recent messages restored from Redis for conversations started by
+        # another worker, consumed when the conversation is created
+        self._restored_history: Dict[str, List[Dict[str, Any]]] = {}
+
+        # In-flight Redis restores by session ID, so concurrent first messages
+        # for a conversation share one read and all wait for its history
+        self._pending_restores: Dict[str, asyncio.Task] = {}
+
+        # Strong references to fire-and-forget persistence tasks
+        self._background_tasks: set = set()
+
+        # Cap in-flight LLM calls across all conversations so bursts queue
+        # here instead of tripping the provider's rate limits
+        self._llm_slots = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
 
         # New: Conversation context tracking for follow-up handling
         self.conversation_contexts: Dict[str, ConversationContext] = {}
@@ -125,8 +348,8 @@ class ChatService:
             os.path.dirname(__file__), "../xfinity_knowledge_base.json"
         )
         try:
-            with open(kb_path, "r") as f:
-                self.kb = json.load(f)["knowledge_base"]["agents"]
+            with open(kb_path, "rb") as f:
+                self.kb = orjson.loads(f.read())["knowledge_base"]["agents"]
         except FileNotFoundError:
             logger.warning("Knowledge base file not found")
             self.kb = {
@@ -134,11 +357,15 @@ class ChatService:
                 "billing": {"categories": {}},
                 "general": {"categories": {}},
             }
+        self._kb_index = {
+            agent: self._build_kb_index(agent_kb.get("categories", {}))
+            for agent, agent_kb in self.kb.items()
+        }
 
-        # Initialize LLM with moderate temperature for balanced creativity (optional)
-        # Temperature 0.7 provides good balance between deterministic and creative responses
+        # Initialize the OpenAI client for LLM fallbacks (optional). Completions
+        # are requested directly, sharing the process-wide HTTP connection pool.
         try:
-            self.llm = ChatOpenAI(temperature=0.7, model_name="gpt-3.5-turbo")
+            self.llm = AsyncOpenAI(http_client=get_openai_http_client())
             self.llm_available = True
         except Exception as e:
             logger.warning(f"LLM initialization failed: {e}")
@@ -179,6 +406,19 @@ class ChatService:
             r"(?:this )?(?:chatbot|bot|system) (?:is )?(?:useless|not helping|broken)",
         ]
 
+        # Compiled once; IGNORECASE replaces lowercasing each message. Only
+        # any-match is needed for follow-ups, so that list is fused into one
+        # alternation. Frustration indicators stay separate: their matches can
+        # overlap, and a single non-overlapping scan would miss some of them.
+        self._follow_up_re = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in self.follow_up_patterns),
+            re.IGNORECASE,
+        )
+        self._frustration_res = [
+            re.compile(pattern, re.IGNORECASE)
+            for pattern in self.frustration_indicators
+        ]
+
         # Tone-specific prompt templates
         self.tone_prompts = {
             "helpful_friendly": """You are a helpful AI customer service assistant for Xfinity. 
@@ -207,16 +447,14 @@ class ChatService:
                 user_id=user_id or conversation_id,
                 current_state=ConversationState.INITIAL,
             )
+            self._touch_conversation(conversation_id)
         return self.conversation_contexts[conversation_id]
 
     def detect_follow_up(self, message: str, context: ConversationContext) -> bool:
         """Detect if message is a follow-up to previous solution."""
-        message_lower = message.lower()
-
         # Check for explicit follow-up patterns
-        for pattern in self.follow_up_patterns:
-            if re.search(pattern, message_lower):
-                return True
+        if self._follow_up_re.search(message):
+            return True
 
         # Context-based detection
         if (
@@ -232,12 +470,11 @@ class ChatService:
         self, message: str, context: ConversationContext
     ) -> int:
         """Analyze frustration level from message content and context."""
-        message_lower = message.lower()
         frustration_score = context.frustration_level
 
         # Check frustration indicators
-        for pattern in self.frustration_indicators:
-            if re.search(pattern, message_lower):
+        for pattern in self._frustration_res:
+            if pattern.search(message):
                 frustration_score += 2
 
         # Caps lock indicates frustration
@@ -246,7 +483,7 @@ class ChatService:
             frustration_score += 1
 
         # Multiple punctuation marks
-        if re.search(r"[!?]{2,}", message):
+        if _REPEATED_PUNCTUATION_RE.search(message):
             frustration_score += 1
 
         # Repeated attempts
@@ -296,28 +533,22 @@ class ChatService:
 
     def get_or_create_conversation_with_tone(
         self, conversation_id: str, tone: str
-    ) -> ConversationChain:
-        """Get or create conversation chain with appropriate tone."""
-
-        if conversation_id not in self.conversations:
-            memory = ConversationBufferMemory(return_messages=True)
-
-            # Create LLM with tone-specific system prompt
-            system_prompt = self.tone_prompts.get(
-                tone, self.tone_prompts["helpful_friendly"]
-            )
-
-            if self.llm_available:
-                # Create new LLM instance with system message
-                llm_with_tone = ChatOpenAI(temperature=0.7, model="gpt-3.5-turbo")
-            else:
-                llm_with_tone = self.llm
-
-            chain = ConversationChain(llm=llm_with_tone, memory=memory, verbose=True)
-
-            self.conversations[conversation_id] = chain
-
-        return self.conversations[conversation_id]
+    ) -> _Conversation:
+        """Get or create a conversation whose system prompt sets the tone."""
+
+        conversation = self.conversations.get(conversation_id)
+        if conversation is not None:
+            self._touch_conversation(conversation_id)
+            return conversation
+
+        # Tone-specific system prompt, with whitespace collapsed so the same
+        # tone always yields the same bytes
+        system_prompt = " ".join(
+            self.tone_prompts.get(tone, self.tone_prompts["helpful_friendly"]).split()
+        )
+        conversation = self._new_conversation(conversation_id, system_prompt)
+        self._store_conversation(conversation_id, conversation)
+        return conversation
 
     def extract_solution_summary(self, response: str) -> str:
         """Extract key solution points for tracking."""
@@ -338,8 +569,8 @@ class ChatService:
     ) -> Dict[str, Any]:
         """Handle follow-up messages with empathy and alternative solutions."""
 
-        # Get conversation chain with appropriate tone
-        chain = self.get_or_create_conversation_with_tone(
+        # Get conversation with appropriate tone
+        conversation = self.get_or_create_conversation_with_tone(
             conversation_id, context.preferred_tone
         )
 
@@ -349,7 +580,7 @@ class ChatService:
         try:
             # Generate response with full conversation context
             if self.llm_available:
-                response = await chain.arun(follow_up_prompt)
+                response = await self._complete(conversation, follow_up_prompt)
             else:
                 response = self.create_empathetic_fallback_text(context)
 
@@ -449,63 +680,160 @@ class ChatService:
 
         return context
 
-    def get_or_create_conversation(self, conversation_id: str) -> ConversationChain:
+    def _new_conversation(
+        self, conversation_id: str, system_prompt: str
+    ) -> _Conversation:
+        """Create a conversation, seeded with any history restored from Redis."""
+        return _Conversation(
+            system_prompt=system_prompt,
+            messages=[
+                {
+                    "role": (
+                        "user"
+                        if record["role"] == RECORD_ROLES["user"]
+                        else "assistant"
+                    ),
+                    "content": record["content"],
+                }
+                for record in self._restored_history.pop(conversation_id, ())
+            ],
+        )
+
+    async def _restore_recent_turns(self, conversation_id: str):
         """
-        Retrieve existing conversation or create new one for session management.
+        Load the recent-turns window of a conversation this process hasn't seen.
 
-        Each conversation maintains its own memory buffer to preserve context
-        across multiple message exchanges. This enables the AI to reference
-        previous parts of the conversation for more coherent responses.
+        Lets a conversation continue on any worker. Restored messages keep the
+        IDs and timestamps they were first recorded with.
+        """
+        records = await cache_service.get_list(
+            CacheKeys.conversation_recent(conversation_id)
+        )
+        if records:
+            self._restored_history[conversation_id] = records
+            self._conversation_cache[conversation_id] = {
+                "id": conversation_id,
+                "messages": list(records),
+                "createdAt": records[0]["timestamp"],
+                "updatedAt": records[-1]["timestamp"],
+            }
 
-        Args:
-            conversation_id: Unique identifier for the conversation session
+    async def _persist_recent_turns(
+        self, conversation_id: str, records: List[Dict[str, Any]]
+    ):
+        """Append new messages to the conversation's capped list in Redis."""
+        await cache_service.push_to_list(
+            CacheKeys.conversation_recent(conversation_id),
+            records,
+            max_length=CONVERSATION_WINDOW_TURNS * 2,  # user + assistant per turn
+            ttl=CONVERSATION_TTL_SECONDS,
+        )
+        await cache_service.add_to_set(
+            CacheKeys.conversation_index(),
+            conversation_id,
+            ttl=CONVERSATION_TTL_SECONDS,
+        )
 
-        Returns:
-            ConversationChain: LangChain conversation object with memory
-        """
-        if conversation_id not in self.conversations:
-            # Create new conversation with buffer memory for context preservation
-            memory = ConversationBufferMemory()
-            chain = ConversationChain(
-                llm=self.llm,
-                memory=memory,
-                verbose=True,  # Enable verbose mode for debugging
+    async def _complete(self, conversation: _Conversation, prompt: str) -> str:
+        """
+        Answer a prompt in a conversation once an LLM concurrency slot is free.
+
+        The request is the system prompt, the last CONVERSATION_WINDOW_TURNS
+        exchanges, and the prompt; only the window is sent, which keeps prompt
+        size bounded for long conversations. The system prompt goes first and
+        history is append-only, so the request prefix stays byte-identical
+        across turns and OpenAI's automatic prompt caching can reuse it.
+        """
+        user_message = {"role": "user", "content": prompt}
+        request = [
+            {"role": "system", "content": conversation.system_prompt},
+            *conversation.messages[-CONVERSATION_WINDOW_TURNS * 2 :],
+            user_message,
+        ]
+        async with self._llm_slots:
+            completion = await self.llm.chat.completions.create(
+                model="gpt-3.5-turbo", messages=request, temperature=0.7
             )
-            self.conversations[conversation_id] = chain
-        return self.conversations[conversation_id]
+        answer = completion.choices[0].message.content or ""
+        conversation.messages.append(user_message)
+        conversation.messages.append({"role": "assistant", "content": answer})
+        return answer
 
-    def normalize(self, text: str) -> str:
+    def get_or_create_conversation(self, conversation_id: str) -> _Conversation:
         """
-        Normalize text for consistent matching across the knowledge base.
+        Retrieve existing conversation or create new one for session management.
 
-        This function standardizes text by:
-        - Converting to lowercase
-        - Removing punctuation and special characters
-        - Converting underscores to spaces
-        - Stripping whitespace
+        Each conversation keeps its own message history to preserve context
+        across multiple message exchanges. This enables the AI to reference
+        previous parts of the conversation for more coherent responses.
 
         Args:
-            text: Raw text to normalize
+            conversation_id: Unique identifier for the conversation session
 
         Returns:
-            str: Normalized text suitable for matching
+            _Conversation: System prompt and message history
+        """
+        conversation = self.conversations.get(conversation_id)
+        if conversation is not None:
+            self._touch_conversation(conversation_id)
+            return conversation
+
+        # Create new conversation with the default tone
+        system_prompt = " ".join(self.tone_prompts["helpful_friendly"].split())
+        conversation = self._new_conversation(conversation_id, system_prompt)
+        self._store_conversation(conversation_id, conversation)
+        return conversation
+
+    def _store_conversation(self, conversation_id: str, conversation: _Conversation):
+        """Add a conversation and mark it as the most recently used."""
+        self.conversations[conversation_id] = conversation
+        self._touch_conversation(conversation_id)
+
+    def _touch_conversation(self, conversation_id: str):
         """
-        return re.sub(r"[^a-z0-9 ]", "", text.lower().replace("_", " ")).strip()
+        Mark a conversation as the most recently used, evicting the least
+        recently used beyond MAX_ACTIVE_CONVERSATIONS.
 
-    def tokenize(self, text: str) -> set:
+        Every turn is already mirrored to Redis by _persist_recent_turns, so an
+        evicted conversation is restored from there on its next message.
         """
-        Tokenize normalized text into a set of unique words.
+        active = self._active_conversations
+        if conversation_id in active:
+            active.move_to_end(conversation_id)
+            return
+
+        active[conversation_id] = None
+        while len(active) > MAX_ACTIVE_CONVERSATIONS:
+            evicted_id, _ = active.popitem(last=False)
+            self.conversations.pop(evicted_id, None)
+            self._conversation_cache.pop(evicted_id, None)
+            self._restored_history.pop(evicted_id, None)
+            self.conversation_contexts.pop(evicted_id, None)
+
+    async def _restore_once(self, conversation_id: str):
+        """
+        Restore a conversation this process holds no state for.
 
-        This creates a set of tokens that can be used for overlap-based
-        matching between user queries and knowledge base entries.
+        Concurrent first messages share one Redis read, and the conversation
+        only becomes active once that read has finished, so none of them can
+        start it with an empty history.
+        """
+        task = self._pending_restores.get(conversation_id)
+        if task is None:
+            task = asyncio.create_task(self._restore_recent_turns(conversation_id))
+            task.add_done_callback(
+                functools.partial(self._finish_restore, conversation_id)
+            )
+            self._pending_restores[conversation_id] = task
 
-        Args:
-            text: Text to tokenize
+        # Shielded so one cancelled request doesn't cancel the shared restore
+        await asyncio.shield(task)
 
-        Returns:
-            set: Set of unique tokens from the text
-        """
-        return set(self.normalize(text).split())
+    def _finish_restore(self, conversation_id: str, task: asyncio.Task):
+        """Mark a conversation active once its restore has finished."""
+        self._pending_restores.pop(conversation_id, None)
+        if not task.cancelled() and task.exception() is None:
+            self._touch_conversation(conversation_id)
 
     def search_agent_kb(self, agent: str, message: str) -> Optional[Dict]:
         """
@@ -527,47 +855,120 @@ class ChatService:
         Returns:
             Optional[Dict]: Best matching response or None if no match found
         """
-        # Get the knowledge base for the specified agent
-        agent_kb = self.kb.get(agent, {}).get("categories", {})
-        best_match = None
-        best_score = 0
+        index = self._kb_index.get(agent)
+        if index is None:
+            return None
 
         # Normalize the user's message for consistent matching
-        message_norm = self.normalize(message)
-        message_tokens = self.tokenize(message)
+        return self._search_kb_index(index, normalize(message), tokenize(message))
+
+    def search_kb(self, agent: str, message: str) -> Tuple[str, Optional[Dict]]:
+        """
+        Search the routed agent's knowledge base, then the other agents'.
 
-        # First pass: Look for direct category name matches
-        for cat_name, cat in agent_kb.items():
-            cat_name_norm = self.normalize(cat_name)
-            cat_name_tokens = self.tokenize(cat_name)
+        The message is tokenized once for all agents. The routed agent's
+        match wins; otherwise the first agent in KB_FALLBACK_ORDER with a
+        match answers.
+
+        Args:
+            agent: Agent type the message was routed to
+            message: User's message to search for
 
-            # Check for direct category name match or token overlap
-            if (
-                cat_name_norm in message_norm
+        Returns:
+            Tuple[str, Optional[Dict]]: Agent that matched (the routed agent
+            when nothing did) and its response, or None
+        """
+        message_norm = normalize(message)
+        message_tokens = tokenize(message)
+        fallbacks = [candidate for candidate in KB_FALLBACK_ORDER if candidate != agent]
+        for candidate in [agent, *fallbacks]:
+            index = self._kb_index.get(candidate)
+            if index is None:
+                continue
+            response = self._search_kb_index(index, message_norm, message_tokens)
+            if response:
+                return candidate, response
+        return agent, None
+
+    def _search_kb_index(
+        self, index: _AgentKBIndex, message_norm: str, message_tokens: frozenset
+    ) -> Optional[Dict]:
+        """Match a normalized, tokenized message against one agent's index."""
+        # First pass: the first category whose name matches the message
+        # directly or shares a token with it answers with its first response
+        token_matched = {
+            cat_idx
+            for token in message_tokens
+            for cat_idx in index.category_postings.get(token, ())
+        }
+        for cat_idx, (cat_name_norm, first_response) in enumerate(index.categories):
+            if first_response is not None and (
+                cat_idx in token_matched
+                or cat_name_norm in message_norm
                 or message_norm in cat_name_norm
-                or cat_name_tokens & message_tokens
             ):
+                return first_response
+
+        # Second pass: score responses by how many of their keywords share a
+        # token with the message; ties go to the earliest response
+        matched_keywords = {
+            kw_id
+            for token in message_tokens
+            for kw_id in index.keyword_postings.get(token, ())
+        }
+        if not matched_keywords:
+            return None
 
-                # Return first response from matching category
-                if cat["responses"]:
-                    return cat["responses"][0]
+        if index.keyword_responses_array is not None:
+            # argmax returns the first maximum, so ties still go to the
+            # earliest response
+            scores = np.bincount(
+                index.keyword_responses_array[list(matched_keywords)],
+                minlength=len(index.responses),
+            )
+            return index.responses[int(scores.argmax())]
 
-            # Second pass: Score responses based on keyword overlap
-            for resp in cat["responses"]:
-                score = 0
+        scores = Counter(index.keyword_responses[kw_id] for kw_id in matched_keywords)
+        best = min(scores, key=lambda resp_idx: (-scores[resp_idx], resp_idx))
+        return index.responses[best]
 
-                # Calculate score based on keyword token overlap
-                for kw in resp["keywords"]:
-                    kw_tokens = self.tokenize(kw)
-                    if kw_tokens & message_tokens:
-                        score += 1
+    def _build_kb_index(self, categories: Dict[str, Dict]) -> _AgentKBIndex:
+        """
+        Tokenize an agent's knowledge base once into inverted indexes.
 
-                # Track the best scoring response
-                if score > best_score:
-                    best_score = score
-                    best_match = resp
+        search_agent_kb then only touches the categories and keywords that
+        share a token with the message instead of re-tokenizing the whole
+        knowledge base on every call.
+        """
+        index = _AgentKBIndex(
+            categories=[],
+            category_postings={},
+            responses=[],
+            keyword_postings={},
+            keyword_responses=[],
+        )
+        for cat_idx, (cat_name, cat) in enumerate(categories.items()):
+            responses = cat["responses"]
+            index.categories.append(
+                (normalize(cat_name), responses[0] if responses else None)
+            )
+            for token in tokenize(cat_name):
+                index.category_postings.setdefault(token, []).append(cat_idx)
 
-        return best_match
+            for resp in responses:
+                resp_idx = len(index.responses)
+                index.responses.append(resp)
+                for kw in resp["keywords"]:
+                    kw_id = len(index.keyword_responses)
+                    index.keyword_responses.append(resp_idx)
+                    for token in tokenize(kw):
+                        index.keyword_postings.setdefault(token, []).append(kw_id)
+
+        if len(index.responses) >= VECTORIZED_SCORING_MIN_RESPONSES:
+            index.keyword_responses_array = np.array(
+                index.keyword_responses, dtype=np.intp
+            )
+        return index
 
     def simple_agent_routing(self, message: str) -> str:
         """
@@ -585,55 +986,9 @@ class ChatService:
         """
         message_lower = message.lower()
 
-        # Define keyword patterns for each agent type
-        tech_keywords = [
-            "internet",
-            "wifi",
-            "modem",
-            "router",
-            "connection",
-            "slow",
-            "outage",
-            "not working",
-            "down",
-            "offline",
-            "reset",
-            "restart",
-            "troubleshoot",
-            "technical",
-            "equipment",
-            "cable",
-            "signal",
-            "speed",
-        ]
-
-        billing_keywords = [
-            "bill",
-            "billing",
-            "payment",
-            "charge",
-            "cost",
-            "price",
-            "fee",
-            "account",
-            "subscription",
-            "plan",
-            "upgrade",
-            "downgrade",
-            "cancel",
-            "refund",
-            "credit",
-            "balance",
-            "due",
-            "overdue",
-            "autopay",
-        ]
-
-        # Count matches for each category
-        tech_score = sum(1 for keyword in tech_keywords if keyword in message_lower)
-        billing_score = sum(
-            1 for keyword in billing_keywords if keyword in message_lower
-        )
+        # Count the distinct keywords of each agent type found in the message
+        tech_score = _count_keywords(_TECH_KEYWORD_MATCHER, message_lower)
+        billing_score = _count_keywords(_BILLING_KEYWORD_MATCHER, message_lower)
 
         # Route based on highest score
         if tech_score > billing_score:
@@ -654,9 +1009,24 @@ class ChatService:
         - Context-aware tone adaptation
         - Frustration level monitoring
         - Business metrics tracking
+        - Persistence of the turn's messages when db_session is given
         """
         start_time = time.time()
 
+        # Stamped on arrival so the reply time isn't used for both rows. The
+        # turn's messages are written together once it completes, so no
+        # connection is held while the response is generated.
+        received_at = datetime.now(timezone.utc)
+        pending_messages = [
+            {
+                "content": message,
+                "sender": "user",
+                "role": "user",
+                "created_at": received_at,
+                "timestamp": received_at,
+            }
+        ]
+
         try:
             # Get or create conversation context
             context = self.get_or_create_context(conversation_id, conversation_id)
@@ -675,6 +1045,22 @@ class ChatService:
                     conversation_id, message, context
                 )
 
+            answered_at = datetime.now(timezone.utc)
+            pending_messages.append(
+                {
+                    "content": response_data["answer"],
+                    "sender": "agent",
+                    "role": "assistant",
+                    "created_at": answered_at,
+                    "timestamp": answered_at,
+                    "agent": response_data.get("agent"),
+                    "agent_type": response_data.get("agent_type"),
+                    "answer_type": response_data.get("answer_type"),
+                    "intent": response_data.get("intent"),
+                    "intent_data": response_data.get("intent_data"),
+                }
+            )
+
             # Update context
             solution_offered = response_data.get("solution_summary")
             self.update_context(conversation_id, message, solution_offered)
@@ -712,6 +1098,22 @@ class ChatService:
                     "tone_used": "helpful_friendly",
                 },
             }
+        finally:
+            # The user message is kept even if building the response failed
+            if db_session is not None:
+                await self._store_turn(db_session, conversation_id, pending_messages)
+
+    async def _store_turn(
+        self, db_session, conversation_id: str, rows: List[Dict[str, Any]]
+    ):
+        """Write a turn's messages with one insert, creating the conversation."""
+        chat_repo = ChatRepository(db_session)
+        try:
+            conversation = await chat_repo.get_or_create_conversation(conversation_id)
+            await chat_repo.add_messages(conversation.id, rows)
+        except Exception as e:
+            logger.error(f"Database error storing messages: {e}")
+            await db_session.rollback()
 
     async def handle_regular_message(
         self, conversation_id: str, message: str, context: ConversationContext
@@ -742,32 +1144,23 @@ class ChatService:
             intent = agent
             intent_data = {"confidence": 0.5, "keywords": []}
 
-        # Step 2: Search knowledge base for relevant response
-        kb_response = self.search_agent_kb(agent, message)
+        # Step 2: Search knowledge base for relevant response, falling back
+        # to the other agents' knowledge bases if the primary has no match
+        agent, kb_response = self.search_kb(agent, message)
 
         if kb_response:
             # Use knowledge base response if found
             answer = kb_response["content"]
             answer_type = kb_response["type"]
-        else:
-            # Search all agents if no match found in primary agent
-            for fallback_agent in ["tech_support", "billing", "general"]:
-                if fallback_agent != agent:
-                    kb_response = self.search_agent_kb(fallback_agent, message)
-                    if kb_response:
-                        answer = kb_response["content"]
-                        answer_type = kb_response["type"]
-                        agent = fallback_agent  # Update agent to the one that found the match
-                        break
 
         if not kb_response:
             # Step 3: Fallback to LLM for complex queries with context-aware tone
             if self.llm_available:
                 try:
-                    chain = self.get_or_create_conversation_with_tone(
+                    conversation = self.get_or_create_conversation_with_tone(
                         conversation_id, context.preferred_tone
                     )
-                    answer = await chain.arun(message)
+                    answer = await self._complete(conversation, message)
                     answer_type = "llm_generated"
                 except Exception as e:
                     # Handle rate limiting and other LLM errors gracefully
@@ -792,148 +1185,6 @@ class ChatService:
             "solution_summary": self.extract_solution_summary(answer),
             "conversation_flow": "regular_flow",
         }
-        """
-        Main coordination method orchestrating the complete response flow.
-
-        This method implements the core business logic for handling user messages:
-        1. Intent classification and agent routing
-        2. Knowledge base search for relevant responses
-        3. LLM fallback for complex or unmatched queries
-        4. Response packaging with metadata
-        5. Database persistence for conversation history
-        6. Error handling and graceful degradation
-
-        The coordinator ensures that every user message receives a response,
-        either from the knowledge base or from the LLM, with appropriate
-        metadata for frontend display and analytics.
-
-        Args:
-            conversation_id: Unique session identifier
-            message: User's input message
-            db_session: Database session for persistence
-
-        Returns:
-            Dict: Complete response with answer, agent info, and metadata
-        """
-        try:
-            # Initialize repository if database session provided
-            chat_repo = ChatRepository(db_session) if db_session else None
-
-            # Store user message in database if available
-            if chat_repo:
-                try:
-                    await chat_repo.get_or_create_conversation(conversation_id)
-                    await chat_repo.add_message(
-                        conversation_id=conversation_id,
-                        content=message,
-                        sender="user",
-                        role="user",
-                    )
-                except Exception as e:
-                    print(f"Database error storing user message: {e}")
-            # Step 1: Classify message intent and route to appropriate agent
-            if self.intent_service_available:
-                try:
-                    intent, intent_data = await self.intent_service.route_message(
-                        message
-                    )
-
-                    # Map intent to agent type for knowledge base lookup
-                    if intent == "technical_support":
-                        agent = "tech_support"
-                    elif intent == "billing":
-                        agent = "billing"
-                    else:
-                        agent = "general"
-                except Exception as e:
-                    print(f"Intent classification failed: {e}")
-                    # Fallback to simple keyword-based routing
-                    agent = self.simple_agent_routing(message)
-                    intent = agent
-                    intent_data = {"confidence": 0.5, "keywords": []}
-            else:
-                # Use simple keyword-based routing when intent service is unavailable
-                agent = self.simple_agent_routing(message)
-                intent = agent
-                intent_data = {"confidence": 0.5, "keywords": []}
-
-            # Step 2: Search knowledge base for relevant response
-            kb_response = self.search_agent_kb(agent, message)
-
-            if kb_response:
-                # Use knowledge base response if found
-                answer = kb_response["content"]
-                answer_type = kb_response["type"]
-            else:
-                # Search all agents if no match found in primary agent
-                for fallback_agent in ["tech_support", "billing", "general"]:
-                    if fallback_agent != agent:
-                        kb_response = self.search_agent_kb(fallback_agent, message)
-                        if kb_response:
-                            answer = kb_response["content"]
-                            answer_type = kb_response["type"]
-                            agent = fallback_agent  # Update agent to the one that found the match
-                            break
-
-                if not kb_response:
-                    # Step 3: Fallback to LLM for complex queries with error handling
-                    if self.llm_available:
-                        try:
-                            chain = self.get_or_create_conversation(conversation_id)
-                            answer = await chain.arun(message)
-                            answer_type = "llm_generated"
-                        except Exception as e:
-                            # Handle rate limiting and other LLM errors gracefully
-                            print(f"LLM error: {e}")
-                            if "rate limit" in str(e).lower() or "429" in str(e):
-                                answer = "I'm here to help with your Xfinity services. I can assist with internet issues, billing questions, equipment troubleshooting, and general support. What specific problem are you experiencing?"
-                            else:
-                                answer = "I found some information that might help you. Could you be more specific about what you're looking for?"
-                            answer_type = "kb_fallback"
-                    else:
-                        # LLM not available, provide helpful fallback
-                        answer = "I'm here to help with your Xfinity services. I can assist with internet issues, billing questions, equipment troubleshooting, and general support. What specific problem are you experiencing?"
-                        answer_type = "kb_fallback"
-
-            # Step 4: Store AI response in database if available
-            response_data = {
-                "answer": answer,
-                "agent": self.kb[agent]["name"],
-                "agent_type": agent,
-                "answer_type": answer_type,
-                "intent": intent,
-                "intent_data": intent_data,
-            }
-
-            if chat_repo:
-                try:
-                    await chat_repo.add_message(
-                        conversation_id=conversation_id,
-                        content=answer,
-                        sender="agent",
-                        role="assistant",
-                        agent=self.kb[agent]["name"],
-                        agent_type=agent,
-                        answer_type=answer_type,
-                        intent=intent,
-                        intent_data=intent_data,
-                    )
-                except Exception as e:
-                    print(f"Database error storing AI response: {e}")
-
-            # Step 5: Package and return response with complete metadata
-            return response_data
-        except Exception as e:
-            print(f"Coordinator error: {e}")
-            # Ultimate fallback response
-            return {
-                "answer": "I'm here to help with your Xfinity services. You can ask me about internet issues, billing questions, or general support.",
-                "agent": "General Support",
-                "agent_type": "general",
-                "answer_type": "error_fallback",
-                "intent": "general",
-                "intent_data": {"confidence": 0.0, "keywords": []},
-            }
 
     async def process_message(
         self, conversation_id: str, message: str, db_session=None
@@ -953,13 +1204,33 @@ class ChatService:
         Returns:
             Dict: Complete response with answer and metadata
         """
-        return await self.coordinator(conversation_id, message, db_session)
+        if conversation_id in self._active_conversations:
+            self._touch_conversation(conversation_id)
+        else:
+            await self._restore_once(conversation_id)
+
+        record = self._conversation_cache.get(conversation_id)
+        recorded = len(record["messages"]) if record else 0
+        try:
+            return await self.coordinator(conversation_id, message, db_session)
+        finally:
+            # Record the new messages now so they are stamped at append time
+            record = self._sync_conversation_record(conversation_id)
+            if record and len(record["messages"]) > recorded:
+                # Mirror them to Redis without delaying the response
+                task = asyncio.create_task(
+                    self._persist_recent_turns(
+                        conversation_id, record["messages"][recorded:]
+                    )
+                )
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
 
     def get_conversation_history(self, conversation_id: str) -> List[Dict]:
         """
         Retrieve conversation history for a specific session.
 
-        This method provides access to the conversation memory, allowing
+        This method provides access to the conversation history, allowing
         for conversation replay, analytics, and context restoration.
         Returns empty list if conversation doesn't exist.
 
@@ -969,7 +1240,84 @@ class ChatService:
         Returns:
             List[Dict]: List of messages in the conversation
         """
-        if conversation_id not in self.conversations:
-            return []
-        memory = self.conversations[conversation_id].memory
-        return memory.chat_memory.messages
+        conversation = self.conversations.get(conversation_id)
+        return conversation.messages if conversation is not None else []
+
+    def iter_conversation_histories(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        Iterate over every stored conversation and its message history.
+
+        Walks the conversation store once, yielding each session ID with its
+        message history, so listing endpoints avoid a second lookup per
+        conversation through get_conversation_history.
+
+        Yields:
+            Tuple[str, List[Dict]]: Session ID and its messages
+        """
+        for conversation_id, conversation in self.conversations.items():
+            yield conversation_id, conversation.messages
+
+    def _sync_conversation_record(self, conversation_id: str) -> Optional[Dict]:
+        """
+        Bring the serialized payload of a conversation up to date.
+
+        Only messages appended since the last sync are serialized, each with a
+        freshly minted ID and timestamp; existing entries are left untouched.
+
+        Args:
+            conversation_id: Unique session identifier
+
+        Returns:
+            Optional[Dict]: Serialized conversation, or None if it doesn't exist
+        """
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
+            return None
+
+        messages = conversation.messages
+        record = self._conversation_cache.get(conversation_id)
+        if record is None:
+            now = datetime.utcnow().isoformat()
+            record = {
+                "id": conversation_id,
+                "messages": [],
+                "createdAt": now,
+                "updatedAt": now,
+            }
+            self._conversation_cache[conversation_id] = record
+
+        serialized = record["messages"]
+        if len(serialized) < len(messages):
+            now = datetime.utcnow().isoformat()
+            for msg in messages[len(serialized) :]:
+                serialized.append(
+                    {
+                        "id": new_message_id(),
+                        "content": msg["content"],
+                        "role": RECORD_ROLES[msg["role"]],
+                        "timestamp": now,
+                        "agent": None,
+                        "agent_type": None,
+                        "answer_type": None,
+                        "intent": None,
+                        "intent_data": None,
+                    }
+                )
+            record["updatedAt"] = now
+
+        return record
+
+    def get_serialized_conversation(self, conversation_id: str) -> Optional[Dict]:
+        """
+        Return a conversation as a JSON-ready dict, or None if it doesn't exist.
+        """
+        return self._sync_conversation_record(conversation_id)
+
+    def get_serialized_conversations(self) -> List[Dict]:
+        """
+        Return every stored conversation as a JSON-ready dict.
+        """
+        return [
+            self._sync_conversation_record(conversation_id)
+            for conversation_id in list(self.conversations)
+        ]
@@ -27,9 +27,15 @@ enabling both transparency and flexible agent assignment logic.
 
 from langchain.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
+from src.services.cache_service import CacheKeys, cache_service
+from src.services.llm_client import get_openai_http_client
 from typing import Dict, List, Tuple
 import json
 
+# Classifications run at temperature 0, so a message's result is reused from
+# Redis by every worker for this long
+INTENT_CACHE_TTL_SECONDS = 60 * 60
+
 
 class IntentService:
     """
@@ -58,6 +64,7 @@ class IntentService:
         self.llm = ChatOpenAI(
             temperature=0,  # Deterministic responses for consistency
             model_name="gpt-3.5-turbo",  # Balance of capability and cost-effectiveness
+            http_async_client=get_openai_http_client(),  # Shared connection pool
         )
 
         # Define the prompt template for intent classification
@@ -103,6 +110,12 @@ class IntentService:
             Dict: Classification result with intent, confidence, and keywords
                  Always returns a valid dict even on parsing errors
         """
+        # Repeated messages skip the LLM call entirely
+        cache_key = CacheKeys.intent_classification(message)
+        cached = await cache_service.get(cache_key)
+        if cached is not None:
+            return cached
+
         # Create and execute the LLM chain with the message
         chain = self.intent_prompt | self.llm
         result = await chain.ainvoke({"message": message})
@@ -110,7 +123,11 @@ class IntentService:
         try:
             # Attempt to parse the LLM response as JSON
             # The LLM is instructed to return structured JSON for easy parsing
-            return json.loads(result.content)
+            intent_data = json.loads(result.content)
+            await cache_service.set(
+                cache_key, intent_data, ttl=INTENT_CACHE_TTL_SECONDS
+            )
+            return intent_data
         except (json.JSONDecodeError, KeyError, AttributeError):
             # Fallback response if JSON parsing fails
             # This ensures the service never fails completely due to LLM output issues
@@ -0,0 +1,45 @@
+"""
+Shared HTTP client for OpenAI calls.
+
+LangChain's ChatOpenAI creates its own httpx client per instance by default,
+so every service paid for separate TLS handshakes and kept separate idle
+connections. All LLM clients in the process share this pool instead, which
+keeps warm keep-alive connections for normal traffic while allowing bursts
+up to the configured connection limit.
+"""
+
+from typing import Optional
+
+import httpx
+
+from src.config.settings import settings
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_openai_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide async HTTP client used for OpenAI requests.
+
+    Returns:
+        httpx.AsyncClient: Pooled client, created on first use
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            # Same defaults as the OpenAI SDK: long reads, quick connect failures
+            timeout=httpx.Timeout(600.0, connect=5.0),
+        )
+    return _http_client
+
+
+async def close_openai_http_client():
+    """Close the shared client and its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -20,8 +20,11 @@ builds a FAISS index for fast retrieval, and provides multiple search modes
 optimized for different use cases and query types.
 """
 
+import hashlib
 import os
-import json
+import orjson
+import threading
+from collections import OrderedDict
 import numpy as np
 from sentence_transformers import SentenceTransformer
 import faiss
@@ -69,6 +72,10 @@ class SemanticKnowledgeBase:
         self.responses = []  # List of response dictionaries with full metadata
         self.embeddings = None  # NumPy array of embeddings corresponding to responses
         self.kb_metadata = []  # Additional metadata for advanced filtering
+        # Lowercased (content, keywords) per response, aligned with self.responses
+        self._search_fields = []
+        # Inverted index: lowercased keyword or keyword token -> response indices
+        self._keyword_index = {}
 
         # Load knowledge base and generate embeddings
         self._load_and_embed()
@@ -89,8 +96,8 @@ class SemanticKnowledgeBase:
         representations that improve search accuracy and recall.
         """
         # Load structured knowledge base from JSON file
-        with open(KB_PATH, "r", encoding="utf-8") as f:
-            kb = json.load(f)["knowledge_base"]["agents"]
+        with open(KB_PATH, "rb") as f:
+            kb = orjson.loads(f.read())["knowledge_base"]["agents"]
 
         texts = []  # List to store text content for embedding
 
@@ -122,6 +129,18 @@ class SemanticKnowledgeBase:
                         }
                     )
 
+                    # Lowercase the matching fields once here rather than per query
+                    keywords_lc = tuple(kw.lower() for kw in resp.get("keywords", []))
+                    self._search_fields.append(
+                        (resp.get("content", "").lower(), keywords_lc)
+                    )
+
+                    # Index each keyword phrase and its tokens for exact lookups
+                    resp_idx = len(self.responses) - 1
+                    for kw in keywords_lc:
+                        for term in (kw, *kw.split()):
+                            self._keyword_index.setdefault(term, set()).add(resp_idx)
+
         # Generate embeddings for all text content
         # show_progress_bar=True provides feedback during the potentially slow embedding process
         self.embeddings = self.model.encode(texts, show_progress_bar=True)
@@ -169,18 +188,10 @@ class SemanticKnowledgeBase:
         Returns:
             List[Dict]: Results with response data and semantic similarity scores
         """
-        # Generate embedding for the query using the same model
-        query_emb = self.model.encode([query])
-
-        # Normalize query embedding for consistent similarity calculation
-        faiss.normalize_L2(query_emb)
-
-        # Search the FAISS index for most similar responses
-        scores, indices = self.index.search(query_emb.astype("float32"), top_k)
-
         # Format results with response data and similarity scores
         results = []
-        for score, idx in zip(scores[0], indices[0]):
+        query_emb = self._embed_query(query)
+        for score, idx in self._semantic_candidates(query_emb, top_k):
             results.append(
                 {
                     "response": self.responses[idx],
@@ -190,37 +201,80 @@ class SemanticKnowledgeBase:
 
         return results
 
-    def keyword_score(self, query, response):
-        """
-        Calculate keyword-based similarity score using fuzzy string matching.
+    def _embed_query(self, query):
+        """Embed a query and L2-normalize it for cosine similarity search."""
+        # Generate embedding for the query using the same model
+        query_emb = self.model.encode([query])
 
-        This method complements semantic search by providing exact and fuzzy
-        keyword matching capabilities. It uses RapidFuzz for efficient fuzzy
-        string matching that handles typos and variations in terminology.
+        # Normalize query embedding for consistent similarity calculation
+        faiss.normalize_L2(query_emb)
+        return query_emb.astype("float32")
+
+    def _semantic_candidates(self, query_emb, top_k):
+        """
+        Return (score, response index) pairs for an embedded query from FAISS.
 
         Args:
-            query: User's search query
-            response: Response dictionary with keywords and content
+            query_emb: Normalized query embedding from _embed_query
+            top_k: Number of nearest responses to retrieve
 
         Returns:
-            float: Keyword similarity score normalized to [0,1]
+            Iterator of (cosine similarity, index into self.responses) pairs
+        """
+        # Search the FAISS index for most similar responses
+        scores, indices = self.index.search(query_emb, top_k)
+        return zip(scores[0], indices[0])
+
+    @staticmethod
+    def _fuzzy_score(query_lc, content_lc, keywords_lc):
+        """
+        Fuzzy-match an already lowercased query against lowercased fields.
+
+        Returns:
+            float: Best token set ratio across keywords and content, in [0,1]
         """
-        # Check fuzzy similarity against all keywords associated with the response
         max_score = 0
-        for kw in response["keywords"]:
+        for kw in keywords_lc:
             # Use token set ratio for flexible matching that handles word order
-            score = fuzz.token_set_ratio(query, kw)
+            score = fuzz.token_set_ratio(query_lc, kw)
             if score > max_score:
                 max_score = score
 
         # Also check similarity against the main response content
-        content_score = fuzz.token_set_ratio(query, response["content"])
+        content_score = fuzz.token_set_ratio(query_lc, content_lc)
 
         # Return the highest score normalized to [0,1] range
         return max(max_score, content_score) / 100.0
 
+    def keyword_score(self, query, response):
+        """
+        Calculate keyword-based similarity score using fuzzy string matching.
+
+        This method complements semantic search by providing exact and fuzzy
+        keyword matching capabilities. It uses RapidFuzz for efficient fuzzy
+        string matching that handles typos and variations in terminology.
+
+        Args:
+            query: User's search query
+            response: Response dictionary with keywords and content
+
+        Returns:
+            float: Keyword similarity score normalized to [0,1]
+        """
+        return self._fuzzy_score(
+            query.lower(),
+            response["content"].lower(),
+            [kw.lower() for kw in response["keywords"]],
+        )
+
     def hybrid_search(
-        self, query, top_k=5, alpha=0.7, filters=None, ranking_boosts=None
+        self,
+        query,
+        top_k=5,
+        alpha=0.7,
+        filters=None,
+        ranking_boosts=None,
+        query_emb=None,
     ):
         """
         Perform hybrid search combining semantic and keyword-based approaches.
@@ -243,18 +297,36 @@ class SemanticKnowledgeBase:
                     e.g., {"difficulty_level": "beginner", "intent_tags": ["modem"]}
             ranking_boosts: Optional dict for quality-based ranking boosts
                            e.g., {"popularity_score": 1.2, "success_rate": 1.1}
+            query_emb: Optional precomputed embedding from _embed_query
 
         Returns:
             List[Dict]: Ranked results with hybrid scores and metadata
         """
+        # Lowercase the query once; response fields were lowercased at load time
+        query_lc = query.lower()
+        if query_emb is None:
+            query_emb = self._embed_query(query)
+
         # Start with semantic search to get candidate responses
         # Retrieve more candidates than needed to allow for filtering and reranking
-        sem_results = self.semantic_search(query, top_k=top_k * 4)
+        candidates = {
+            idx: float(score)
+            for score, idx in self._semantic_candidates(query_emb, top_k * 4)
+        }
+
+        # Responses with a keyword (or keyword token) equal to the query are
+        # exact keyword hits: look them up in the inverted index so they are
+        # ranked even when semantic search did not retrieve them
+        exact_hits = self._keyword_index.get(query_lc.strip(), ())
+        for idx in exact_hits:
+            if idx not in candidates:
+                candidates[idx] = float(self.embeddings[idx] @ query_emb[0])
 
         filtered_results = []
 
-        for r in sem_results:
-            resp = r["response"]
+        for idx, semantic_score in candidates.items():
+            resp = self.responses[idx]
+            r = {"response": resp, "semantic_score": semantic_score}
 
             # Apply metadata filters if specified
             if filters:
@@ -279,8 +351,14 @@ class SemanticKnowledgeBase:
                 if not passed:
                     continue
 
-            # Calculate keyword-based similarity score
-            r["keyword_score"] = self.keyword_score(query, resp)
+            # Calculate keyword-based similarity score; an exact keyword hit is
+            # already a perfect token set match, so skip the fuzzy scan for it
+            if idx in exact_hits:
+                r["keyword_score"] = 1.0
+            else:
+                r["keyword_score"] = self._fuzzy_score(
+                    query_lc, *self._search_fields[idx]
+                )
 
             # Combine semantic and keyword scores using weighted average
             r["hybrid_score"] = (
@@ -302,3 +380,82 @@ class SemanticKnowledgeBase:
 
         # Return top-k results
         return filtered_results[:top_k]
+
+
+class SemanticCache:
+    """
+    Cache-on-miss semantic cache in front of SemanticKnowledgeBase.hybrid_search.
+
+    Queries are embedded once and compared against the embeddings of previously
+    answered queries. If a cached query with the same search parameters has a
+    cosine similarity at or above the threshold, its results are returned and
+    the vector search is skipped entirely. Entries are evicted least recently
+    used first once max_size is reached.
+    """
+
+    def __init__(self, kb, threshold=0.95, max_size=256):
+        """
+        Args:
+            kb: SemanticKnowledgeBase to search on cache misses
+            threshold: Minimum cosine similarity for a cached query to match
+            max_size: Maximum number of cached queries
+        """
+        self.kb = kb
+        self.threshold = threshold
+        self.max_size = max_size
+
+        # Fixed slots so a lookup is a single matrix-vector product
+        dim = kb.embeddings.shape[1]
+        self._embeddings = np.zeros((max_size, dim), dtype="float32")
+        self._param_ids = np.full(max_size, -1, dtype=np.int64)
+        self._results = [None] * max_size
+        self._lru = OrderedDict()  # slot -> None, least recently used first
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _param_id(top_k, alpha, filters, ranking_boosts):
+        # Derived from the parameters themselves, so no per-combination state
+        # is kept; 63 bits keeps it clear of the -1 empty-slot marker
+        key = orjson.dumps(
+            [top_k, alpha, filters, ranking_boosts], option=orjson.OPT_SORT_KEYS
+        )
+        digest = hashlib.blake2b(key, digest_size=8).digest()
+        return int.from_bytes(digest, "big") >> 1
+
+    def hybrid_search(
+        self, query, top_k=5, alpha=0.7, filters=None, ranking_boosts=None
+    ):
+        """Same contract as SemanticKnowledgeBase.hybrid_search, with caching."""
+        query_emb = self.kb._embed_query(query)
+
+        with self._lock:
+            param_id = self._param_id(top_k, alpha, filters, ranking_boosts)
+            if self._lru:
+                # Only compare against entries cached with the same parameters
+                sims = self._embeddings @ query_emb[0]
+                sims[self._param_ids != param_id] = -1.0
+                slot = int(np.argmax(sims))
+                if sims[slot] >= self.threshold:
+                    self._lru.move_to_end(slot)
+                    return self._results[slot]
+
+        results = self.kb.hybrid_search(
+            query,
+            top_k=top_k,
+            alpha=alpha,
+            filters=filters,
+            ranking_boosts=ranking_boosts,
+            query_emb=query_emb,
+        )
+
+        with self._lock:
+            if len(self._lru) < self.max_size:
+                slot = len(self._lru)
+            else:
+                slot, _ = self._lru.popitem(last=False)
+            self._embeddings[slot] = query_emb[0]
+            self._param_ids[slot] = param_id
+            self._results[slot] = results
+            self._lru[slot] = None
+
+        return results
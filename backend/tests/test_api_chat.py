@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from httpx import AsyncClient
 from backend.src.main import app
@@ -17,7 +19,7 @@ async def test_send_message_kb(monkeypatch):
     from backend.src.api.chat import get_chat_service
 
     class DummyChatService:
-        async def process_message(self, conversation_id, message):
+        async def process_message(self, conversation_id, message, db_session=None):
             return {
                 "answer": "KB answer",
                 "agent": "Tech Support",
@@ -54,3 +56,59 @@ async def test_get_conversations():
 def test_websocket_endpoint_structure():
     # Placeholder for WebSocket test
     pass
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.client_state = "CONNECTED"
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+
+@pytest.mark.asyncio
+async def test_send_queue_drops_oldest_when_full(monkeypatch):
+    from backend.src.api.chat import ChatConnectionManager, settings
+
+    monkeypatch.setattr(settings, "WS_SEND_QUEUE_SIZE", 2)
+    manager = ChatConnectionManager()
+    await manager.connect(FakeWebSocket(), "client-1")
+
+    for i in range(3):
+        await manager.send_personal_message({"n": i}, "client-1")
+
+    queue = manager.send_queues["client-1"]
+    assert [queue.get_nowait() for _ in range(queue.qsize())] == [{"n": 1}, {"n": 2}]
+
+
+@pytest.mark.asyncio
+async def test_writer_drains_queue_to_socket():
+    from backend.src.api.chat import ChatConnectionManager
+
+    manager = ChatConnectionManager()
+    websocket = FakeWebSocket()
+    await manager.connect(websocket, "client-1")
+    await manager.broadcast({"type": "notice"})
+    await manager.send_personal_message({"type": "reply"}, "client-1")
+
+    writer = asyncio.create_task(manager.run_writer("client-1"))
+    while manager.send_queues["client-1"].qsize():
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    writer.cancel()
+
+    assert websocket.sent == ['{"type":"notice"}', '{"type":"reply"}']
+    assert manager.get_client_metadata("client-1")["message_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_send_to_unknown_client_is_ignored():
+    from backend.src.api.chat import ChatConnectionManager
+
+    manager = ChatConnectionManager()
+    await manager.send_personal_message({"type": "reply"}, "missing")
+    assert manager.send_queues == {}
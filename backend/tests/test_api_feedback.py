@@ -29,3 +29,52 @@ async def test_submit_feedback_root():
         response = await ac.post("/api/v1/feedback/", json=payload)
         assert response.status_code == 200
         assert response.json()["status"] == "received"
+
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return self
+
+    def scalars(self):
+        return []
+
+
+def compiled_sql(statement):
+    return str(statement.compile(compile_kwargs={"literal_binds": True}))
+
+
+@pytest.mark.asyncio
+async def test_export_first_page_is_limited():
+    from backend.src.api.feedback import export_feedback
+
+    db = RecordingSession()
+    await export_feedback(format="json", stream=False, after_id=None, limit=2, db=db)
+
+    sql = compiled_sql(db.statements[0])
+    assert "ORDER BY feedback.id" in sql
+    assert "LIMIT 2" in sql
+    assert "feedback.id >" not in sql
+
+
+@pytest.mark.asyncio
+async def test_export_next_page_starts_after_cursor():
+    from backend.src.api.feedback import export_feedback
+
+    db = RecordingSession()
+    await export_feedback(format="json", stream=False, after_id=40, limit=2, db=db)
+
+    sql = compiled_sql(db.statements[0])
+    assert "feedback.id > 40" in sql
+    assert "LIMIT 2" in sql
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [0, 1001])
+async def test_export_rejects_out_of_range_limit(limit):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get(f"/api/v1/feedback/export?limit={limit}")
+        assert response.status_code == 422
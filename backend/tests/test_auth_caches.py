@@ -0,0 +1,88 @@
+import time
+from datetime import timedelta
+
+import pytest
+from backend.src.middleware import auth_middleware as auth_module
+from backend.src.middleware.auth_middleware import (
+    AgentAuthMiddleware,
+    AuthenticationError,
+)
+
+
+class CountingPasswordContext:
+    def __init__(self, valid_password):
+        self.valid_password = valid_password
+        self.calls = 0
+
+    def verify(self, plain_password, hashed_password):
+        self.calls += 1
+        return plain_password == self.valid_password
+
+
+def test_successful_password_verification_is_cached(monkeypatch):
+    context = CountingPasswordContext("secret")
+    monkeypatch.setattr(auth_module, "pwd_context", context)
+    middleware = AgentAuthMiddleware()
+
+    assert middleware.verify_password("secret", "hash")
+    assert middleware.verify_password("secret", "hash")
+    assert context.calls == 1
+
+
+def test_failed_password_verification_is_not_cached(monkeypatch):
+    context = CountingPasswordContext("secret")
+    monkeypatch.setattr(auth_module, "pwd_context", context)
+    middleware = AgentAuthMiddleware()
+
+    assert not middleware.verify_password("wrong", "hash")
+    assert not middleware.verify_password("wrong", "hash")
+    assert context.calls == 2
+
+
+def test_password_cache_is_keyed_by_hash(monkeypatch):
+    context = CountingPasswordContext("secret")
+    monkeypatch.setattr(auth_module, "pwd_context", context)
+    middleware = AgentAuthMiddleware()
+
+    middleware.verify_password("secret", "hash-1")
+    middleware.verify_password("secret", "hash-2")
+    assert context.calls == 2
+
+
+def test_decoded_token_is_cached():
+    middleware = AgentAuthMiddleware()
+    token = middleware.create_access_token({"user_id": "user-1"})
+    decode = middleware._decode
+    calls = []
+
+    def counting_decode(token):
+        calls.append(token)
+        return decode(token)
+
+    middleware._decode = counting_decode
+
+    assert middleware.verify_token(token)["user_id"] == "user-1"
+    assert middleware.verify_token(token)["user_id"] == "user-1"
+    assert len(calls) == 1
+
+
+def test_cached_token_still_expires(monkeypatch):
+    middleware = AgentAuthMiddleware()
+    token = middleware.create_access_token(
+        {"user_id": "user-1"}, expires_delta=timedelta(seconds=5)
+    )
+    middleware.verify_token(token)
+
+    later = time.time() + 10
+    monkeypatch.setattr(auth_module.time, "time", lambda: later)
+    with pytest.raises(AuthenticationError, match="expired"):
+        middleware.verify_token(token)
+
+
+def test_invalid_token_is_rejected_every_time():
+    middleware = AgentAuthMiddleware()
+
+    for _ in range(2):
+        with pytest.raises(AuthenticationError, match="Invalid token"):
+            middleware.verify_token("not-a-jwt")
+    assert not middleware._verified_tokens
@@ -0,0 +1,151 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from backend.src.repositories.chat_repository import ChatRepository
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = list(rows)
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return list(self._rows)
+
+    def scalar_one(self):
+        assert len(self._rows) == 1
+        return self._rows[0]
+
+    def scalar_one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+class FakeSession:
+    """Records executed statements and returns queued rows in order."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+        self.commits = 0
+
+    async def execute(self, statement, params=None):
+        self.calls.append((statement, params))
+        return FakeResult(self.results.pop(0))
+
+    async def commit(self):
+        self.commits += 1
+
+
+def make_message(minutes):
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=minutes)
+    return SimpleNamespace(id=uuid.uuid4(), created_at=created_at)
+
+
+@pytest.mark.asyncio
+async def test_conversation_messages_pages_by_cursor():
+    conversation_pk = uuid.uuid4()
+    oldest, middle, newest = make_message(0), make_message(1), make_message(2)
+    # Rows come back newest first, as ORDER BY created_at DESC, id DESC does
+    session = FakeSession(
+        [conversation_pk], [newest, middle], [conversation_pk], [oldest]
+    )
+    repo = ChatRepository(session)
+
+    page, cursor = await repo.get_conversation_messages("test-conv", limit=2)
+    assert page == [middle, newest]
+    assert cursor == (middle.created_at, middle.id)
+
+    page, cursor = await repo.get_conversation_messages(
+        "test-conv", limit=2, before=cursor
+    )
+    assert page == [oldest]
+    assert cursor is None
+
+    _, params = session.calls[3]
+    assert params["conversation_pk"] == conversation_pk
+    assert params["before_created_at"] == middle.created_at
+    assert params["before_id"] == middle.id
+
+
+@pytest.mark.asyncio
+async def test_conversation_messages_unknown_conversation():
+    repo = ChatRepository(FakeSession([]))
+    assert await repo.get_conversation_messages("missing") == ([], None)
+
+
+@pytest.mark.asyncio
+async def test_add_messages_batches_turn_in_one_insert():
+    conversation_pk = uuid.uuid4()
+    session = FakeSession([SimpleNamespace(), SimpleNamespace()])
+    repo = ChatRepository(session)
+
+    await repo.add_messages(
+        conversation_pk,
+        [
+            {"content": "hi", "sender": "user", "role": "user"},
+            {
+                "content": "hello",
+                "sender": "agent",
+                "role": "assistant",
+                "intent_data": {"confidence": 0.9},
+            },
+        ],
+    )
+
+    assert len(session.calls) == 1
+    assert session.commits == 1
+    _, params = session.calls[0]
+    user_row, assistant_row = params
+    # Every row carries the same columns and its own, ordered timestamps
+    assert user_row.keys() == assistant_row.keys()
+    assert user_row["created_at"] < assistant_row["created_at"]
+    assert user_row["timestamp"] == user_row["created_at"]
+    assert user_row["conversation_id"] == conversation_pk
+    assert user_row["confidence"] is None
+    assert assistant_row["confidence"] == 0.9
+
+
+@pytest.mark.asyncio
+async def test_add_messages_keeps_given_timestamps():
+    received_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    session = FakeSession([SimpleNamespace()])
+    repo = ChatRepository(session)
+
+    await repo.add_messages(
+        uuid.uuid4(),
+        [
+            {
+                "content": "hi",
+                "sender": "user",
+                "role": "user",
+                "created_at": received_at,
+                "timestamp": received_at,
+            }
+        ],
+    )
+
+    _, params = session.calls[0]
+    assert params[0]["created_at"] == received_at
+
+
+@pytest.mark.asyncio
+async def test_add_messages_without_rows_skips_insert():
+    session = FakeSession()
+    assert await ChatRepository(session).add_messages(uuid.uuid4(), []) == []
+    assert session.calls == []
+
+
+@pytest.mark.asyncio
+async def test_get_or_create_conversation_reads_existing_row():
+    existing = SimpleNamespace(session_id="test-conv")
+    # ON CONFLICT DO NOTHING returns no row, so the session_id lookup runs
+    session = FakeSession([], [existing])
+    repo = ChatRepository(session)
+
+    assert await repo.get_or_create_conversation("test-conv") is existing
+    assert session.calls[1][1] == {"session_id": "test-conv"}
+    assert session.commits == 0
@@ -0,0 +1,142 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from backend.src.services import chat_service as chat_service_module
+from backend.src.services.chat_service import (
+    ChatService,
+    ConversationContext,
+    ConversationState,
+    _BILLING_KEYWORD_MATCHER,
+    _TECH_KEYWORD_MATCHER,
+    _count_keywords,
+    _keyword_matcher,
+)
+
+
+@pytest.fixture(scope="module")
+def chat_service():
+    return ChatService()
+
+
+def new_context():
+    return ConversationContext(
+        conversation_id="test-conv",
+        user_id="user-1",
+        current_state=ConversationState.INITIAL,
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "my bill is overdue and billing won't answer",
+        "downgrade my plan and cancel autopay",
+        "internet down, modem not working, router restart did nothing",
+        "billbillingbill",
+    ],
+)
+def test_keyword_matcher_counts_like_substring_checks(text):
+    for keywords in (
+        ("bill", "billing", "due", "overdue", "down", "downgrade"),
+        ("internet", "down", "not working", "modem", "router", "restart", "reset"),
+    ):
+        expected = sum(1 for keyword in keywords if keyword in text)
+        assert _count_keywords(_keyword_matcher(keywords), text) == expected
+
+
+def test_routing_keyword_matchers():
+    assert _count_keywords(_TECH_KEYWORD_MATCHER, "wifi signal is slow") == 3
+    assert _count_keywords(_BILLING_KEYWORD_MATCHER, "overdue bill") == 3
+
+
+def test_frustration_counts_overlapping_indicators(chat_service):
+    # The two indicators share "that"; each still adds 2
+    message = "we already tried that makes no sense"
+    assert chat_service.detect_frustration_level(message, new_context()) == 4
+
+
+def test_frustration_counts_each_indicator_once(chat_service):
+    message = "frustrating, really frustrating"
+    assert chat_service.detect_frustration_level(message, new_context()) == 2
+
+
+def test_follow_up_patterns(chat_service):
+    context = new_context()
+    assert chat_service.detect_follow_up("That didn't work either", context)
+    assert not chat_service.detect_follow_up(
+        "How do I set up parental controls on my new router?", context
+    )
+
+
+def test_conversation_state_is_evicted_together(monkeypatch):
+    monkeypatch.setattr(chat_service_module, "MAX_ACTIVE_CONVERSATIONS", 2)
+    service = ChatService()
+
+    service.get_or_create_conversation("first")
+    service.get_or_create_context("first")
+    service.get_or_create_context("second")
+    service.get_or_create_context("third")
+
+    assert "first" not in service.conversations
+    assert "first" not in service.conversation_contexts
+    assert list(service.conversation_contexts) == ["second", "third"]
+
+
+@pytest.mark.asyncio
+async def test_coordinator_stores_turn_in_one_batch(monkeypatch, chat_service):
+    stored = []
+
+    class FakeRepository:
+        def __init__(self, db):
+            pass
+
+        async def get_or_create_conversation(self, conversation_id):
+            return SimpleNamespace(id="conversation-pk")
+
+        async def add_messages(self, conversation_pk, rows):
+            stored.append((conversation_pk, rows))
+
+    monkeypatch.setattr(chat_service_module, "ChatRepository", FakeRepository)
+    response = await chat_service.coordinator(
+        "stored-conv", "my modem keeps restarting", db_session=object()
+    )
+
+    [(conversation_pk, [user_row, assistant_row])] = stored
+    assert conversation_pk == "conversation-pk"
+    assert user_row["role"] == "user"
+    assert user_row["content"] == "my modem keeps restarting"
+    assert assistant_row["role"] == "assistant"
+    assert assistant_row["content"] == response["answer"]
+    assert user_row["created_at"] <= assistant_row["created_at"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_messages_share_one_restore(monkeypatch):
+    service = ChatService()
+    records = [
+        {"role": "human", "content": "hi", "timestamp": "2024-01-01T00:00:00"},
+        {"role": "ai", "content": "hello", "timestamp": "2024-01-01T00:00:01"},
+    ]
+    reads = []
+
+    async def get_list(key):
+        reads.append(key)
+        await asyncio.sleep(0)
+        return records
+
+    monkeypatch.setattr(chat_service_module.cache_service, "get_list", get_list)
+
+    async def first_message():
+        await service._restore_once("restored-conv")
+        # Nothing is active until the restore finishes, so every caller
+        # builds the conversation from the restored history
+        return service.get_or_create_conversation("restored-conv")
+
+    first, second = await asyncio.gather(first_message(), first_message())
+
+    assert len(reads) == 1
+    assert first is second
+    assert [m["content"] for m in first.messages] == ["hi", "hello"]
+    assert "restored-conv" in service._active_conversations
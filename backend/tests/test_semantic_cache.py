@@ -0,0 +1,78 @@
+import numpy as np
+from backend.src.services.semantic_search import SemanticCache
+
+
+class FakeKnowledgeBase:
+    """Embeds each known query as a fixed unit vector and counts searches."""
+
+    def __init__(self, vectors):
+        self.vectors = {
+            query: np.asarray(vector, dtype="float32") / np.linalg.norm(vector)
+            for query, vector in vectors.items()
+        }
+        self.embeddings = np.zeros((1, 3), dtype="float32")
+        self.searches = []
+
+    def _embed_query(self, query):
+        return self.vectors[query][None, :]
+
+    def hybrid_search(self, query, **kwargs):
+        self.searches.append(query)
+        return [{"response": query}]
+
+
+def make_cache(max_size=2):
+    kb = FakeKnowledgeBase(
+        {
+            "reset my modem": [1.0, 0.0, 0.0],
+            "how do I reset my modem": [1.0, 0.05, 0.0],
+            "pay my bill": [0.0, 1.0, 0.0],
+            "cancel service": [0.0, 0.0, 1.0],
+        }
+    )
+    return kb, SemanticCache(kb, threshold=0.95, max_size=max_size)
+
+
+def test_similar_query_reuses_cached_results():
+    kb, cache = make_cache()
+
+    first = cache.hybrid_search("reset my modem")
+    second = cache.hybrid_search("how do I reset my modem")
+
+    assert second is first
+    assert kb.searches == ["reset my modem"]
+
+
+def test_different_parameters_miss_the_cache():
+    kb, cache = make_cache()
+
+    cache.hybrid_search("reset my modem", top_k=5)
+    cache.hybrid_search("reset my modem", top_k=3)
+    cache.hybrid_search("reset my modem", filters={"agent": "billing"})
+
+    assert len(kb.searches) == 3
+
+
+def test_parameter_ids_are_stable_and_key_order_independent():
+    assert SemanticCache._param_id(5, 0.7, {"a": 1, "b": 2}, None) == (
+        SemanticCache._param_id(5, 0.7, {"b": 2, "a": 1}, None)
+    )
+    assert SemanticCache._param_id(5, 0.7, None, None) >= 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    kb, cache = make_cache(max_size=2)
+
+    cache.hybrid_search("reset my modem")
+    cache.hybrid_search("pay my bill")
+    cache.hybrid_search("reset my modem")  # hit; "pay my bill" is now oldest
+    cache.hybrid_search("cancel service")
+    cache.hybrid_search("reset my modem")
+    cache.hybrid_search("pay my bill")
+
+    assert kb.searches == [
+        "reset my modem",
+        "pay my bill",
+        "cancel service",
+        "pay my bill",
+    ]
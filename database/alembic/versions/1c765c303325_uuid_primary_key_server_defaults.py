@@ -0,0 +1,40 @@
+"""Generate conversation and message ids in the database
+
+Revision ID: 1c765c303325
+Revises: 8c20c744552c
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c765c303325'
+down_revision: Union[str, None] = '8c20c744552c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UUID_KEYED_TABLES = ('conversations', 'messages')
+
+
+def upgrade() -> None:
+    # The models leave id to the server default, so inserts fail without it.
+    # gen_random_uuid() is built in from PostgreSQL 13; pgcrypto provides it
+    # on older servers
+    op.execute('CREATE EXTENSION IF NOT EXISTS pgcrypto')
+    for table in UUID_KEYED_TABLES:
+        op.alter_column(table, 'id',
+                        existing_type=sa.UUID(),
+                        existing_nullable=False,
+                        server_default=sa.text('gen_random_uuid()'))
+
+
+def downgrade() -> None:
+    for table in UUID_KEYED_TABLES:
+        op.alter_column(table, 'id',
+                        existing_type=sa.UUID(),
+                        existing_nullable=False,
+                        server_default=None)
@@ -0,0 +1,29 @@
+"""Index the intent key of messages.intent_data
+
+Revision ID: 562e7fe397ca
+Revises: a6125cb721ca
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '562e7fe397ca'
+down_revision: Union[str, None] = 'a6125cb721ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ->> isn't a GIN operator, so intent_data->>'intent' = ? filters need a
+    # B-tree expression index
+    op.create_index('ix_messages_intent', 'messages',
+                    [sa.text("(intent_data->>'intent')")], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_intent', table_name='messages')
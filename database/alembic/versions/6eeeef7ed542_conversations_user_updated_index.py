@@ -0,0 +1,33 @@
+"""Index conversations by user and most recent update
+
+Revision ID: 6eeeef7ed542
+Revises: b6927bbc5822
+Create Date: 2026-10-16 15:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6eeeef7ed542'
+down_revision: Union[str, None] = 'b6927bbc5822'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Matches get_user_conversations (WHERE user_id = ? ORDER BY updated_at
+    # DESC LIMIT ?). The composite index also serves plain user_id lookups,
+    # so it replaces ix_conversations_user_id
+    op.create_index('ix_conversations_user_updated', 'conversations',
+                    ['user_id', sa.text('updated_at DESC')], unique=False)
+    op.drop_index('ix_conversations_user_id', table_name='conversations')
+
+
+def downgrade() -> None:
+    op.create_index('ix_conversations_user_id', 'conversations', ['user_id'],
+                    unique=False)
+    op.drop_index('ix_conversations_user_updated', table_name='conversations')
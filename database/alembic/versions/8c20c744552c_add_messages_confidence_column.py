@@ -0,0 +1,33 @@
+"""Promote intent_data confidence to a messages column
+
+Revision ID: 8c20c744552c
+Revises: 562e7fe397ca
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c20c744552c'
+down_revision: Union[str, None] = '562e7fe397ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('messages', sa.Column('confidence', sa.Float(), nullable=True))
+    # Backfill from existing rows; intent_data comes from LLM output, so only
+    # numeric values are copied
+    op.execute("""
+        UPDATE messages
+        SET confidence = (intent_data->>'confidence')::double precision
+        WHERE jsonb_typeof(intent_data->'confidence') = 'number'
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('messages', 'confidence')
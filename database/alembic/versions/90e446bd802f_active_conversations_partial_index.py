@@ -0,0 +1,32 @@
+"""Partial index on active conversations by user
+
+Revision ID: 90e446bd802f
+Revises: 6eeeef7ed542
+Create Date: 2026-10-16 15:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '90e446bd802f'
+down_revision: Union[str, None] = '6eeeef7ed542'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # status is low-cardinality and nearly every filter on it asks for
+    # 'active', so a partial index over those rows is far smaller than a
+    # full one
+    op.create_index('ix_conversations_active_user_updated', 'conversations',
+                    ['user_id', sa.text('updated_at DESC')], unique=False,
+                    postgresql_where=sa.text("status = 'active'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_conversations_active_user_updated',
+                  table_name='conversations')
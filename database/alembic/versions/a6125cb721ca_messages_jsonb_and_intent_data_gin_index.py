@@ -0,0 +1,44 @@
+"""Store message JSON as JSONB and index intent_data for containment queries
+
+Revision ID: a6125cb721ca
+Revises: ffacf1f6321a
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6125cb721ca'
+down_revision: Union[str, None] = 'ffacf1f6321a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The models declare these as JSONB; GIN operator classes need it too
+    for column in ('meta', 'intent_data'):
+        op.alter_column('messages', column,
+                        type_=postgresql.JSONB(astext_type=sa.Text()),
+                        existing_type=sa.JSON(),
+                        existing_nullable=True,
+                        postgresql_using=f'{column}::jsonb')
+    # jsonb_path_ops only supports @> style containment, but is about half
+    # the size of the default jsonb_ops index
+    op.create_index('ix_messages_intent_data_gin', 'messages', ['intent_data'],
+                    unique=False, postgresql_using='gin',
+                    postgresql_ops={'intent_data': 'jsonb_path_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_intent_data_gin', table_name='messages')
+    for column in ('meta', 'intent_data'):
+        op.alter_column('messages', column,
+                        type_=sa.JSON(),
+                        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+                        existing_nullable=True,
+                        postgresql_using=f'{column}::json')
@@ -0,0 +1,29 @@
+"""Index messages.meta for JSONB key and containment queries
+
+Revision ID: a89db09974e2
+Revises: 90e446bd802f
+Create Date: 2026-10-16 15:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a89db09974e2'
+down_revision: Union[str, None] = '90e446bd802f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # meta holds free-form keys, so this keeps the default jsonb_ops class,
+    # which also serves the ? key-existence operators, unlike jsonb_path_ops
+    op.create_index('ix_messages_meta_gin', 'messages', ['meta'],
+                    unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_meta_gin', table_name='messages')
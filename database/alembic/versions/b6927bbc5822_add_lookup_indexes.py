@@ -0,0 +1,36 @@
+"""Index conversations by user, messages by conversation and feedback by message
+
+Revision ID: b6927bbc5822
+Revises: 1c765c303325
+Create Date: 2026-10-16 15:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6927bbc5822'
+down_revision: Union[str, None] = '1c765c303325'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Listing a user's conversations, a conversation's messages or a
+    # message's feedback otherwise scans the whole table. session_id is
+    # already indexed through its unique constraint
+    op.create_index('ix_conversations_user_id', 'conversations', ['user_id'],
+                    unique=False)
+    op.create_index('ix_messages_conversation_created', 'messages',
+                    ['conversation_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_feedback_message_id'), 'feedback', ['message_id'],
+                    unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_feedback_message_id'), table_name='feedback')
+    op.drop_index('ix_messages_conversation_created', table_name='messages')
+    op.drop_index('ix_conversations_user_id', table_name='conversations')